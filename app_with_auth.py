@@ -10,7 +10,7 @@ import os
 # Add src directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from auth import require_authentication, SUPABASE_SQL_SCHEMA
+from auth import require_authentication, get_schema
 
 # Import the main app function from app.py
 import importlib.util
@@ -59,12 +59,13 @@ def show_setup_instructions():
     """)
     
     # Show SQL schema in a code block
-    st.code(SUPABASE_SQL_SCHEMA, language='sql')
+    schema_sql = get_schema()
+    st.code(schema_sql, language='sql')
     
     # Download button for SQL schema
     st.download_button(
         label="📄 Download SQL Schema",
-        data=SUPABASE_SQL_SCHEMA,
+        data=schema_sql,
         file_name="disaster_relief_schema.sql",
         mime="text/sql"
     )
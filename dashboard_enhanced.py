@@ -20,7 +20,7 @@ from data_preprocessing import DisasterDataPreprocessor
 from ml_model import DisasterSeverityModel
 from resource_allocator import ResourceAllocator
 from user_profile import (
-    UserProfileManager, create_profile_interface, 
+    get_profile_manager, create_profile_interface, 
     log_prediction_activity, log_resource_allocation, 
     log_bulk_processing, check_user_permission
 )
@@ -660,8 +660,8 @@ def main():
         user_email = st.session_state.user.get('email', 'Unknown')
         st.sidebar.markdown(f"👤 **Welcome, {user_email.split('@')[0]}!**")
         
-        # Initialize profile manager and update login
-        profile_manager = UserProfileManager()
+        # Shared profile manager and update login
+        profile_manager = get_profile_manager()
         user_id = st.session_state.user.get('id')
         profile = profile_manager.get_profile(user_id)
         
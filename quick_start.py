@@ -6,7 +6,14 @@ Automatically sets up and launches the application.
 import subprocess
 import sys
 import os
-import time
+
+def _exists(path):
+    """Return True if path exists, using a single stat call."""
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
 
 def run_command(command, description):
     """Run a command and print status."""
@@ -14,33 +21,39 @@ def run_command(command, description):
     print("-" * 50)
     
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
+        # Stream output line by line instead of buffering it until exit
+        with subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, bufsize=1) as process:
+            for line in process.stdout:
+                print(line, end='')
+            returncode = process.wait()
+        if returncode == 0:
             print("✅ Success!")
-            if result.stdout:
-                print(result.stdout)
         else:
             print("❌ Error!")
-            print(result.stderr)
-        return result.returncode == 0
+        return returncode == 0
     except Exception as e:
         print(f"❌ Exception: {e}")
         return False
 
+def launch_streamlit(app_file):
+    """Replace this process with streamlit, run through this interpreter so PATH doesn't matter."""
+    os.execv(sys.executable, [sys.executable, "-m", "streamlit", "run", app_file])
+
 def main():
     """Main quick start function."""
     print("🚨 DISASTER RELIEF RESOURCE OPTIMIZER - QUICK START")
     print("=" * 60)
     
     # Check if we're in the right directory
-    if not os.path.exists("src/data_preprocessing.py"):
+    if not _exists("src/data_preprocessing.py"):
         print("❌ Please run this script from the disaster-relief-optimizer directory")
         return
     
     # Step 1: Check if model exists, if not train it
-    if not os.path.exists("models/model.pkl"):
+    if not _exists("models/model.pkl"):
         print("\n🤖 Training ML model...")
-        success = run_command("python train_model.py", "Training Random Forest model")
+        success = run_command("python train_model.py", "Training severity model")
         if not success:
             print("❌ Model training failed. Please check the error messages above.")
             return
@@ -82,20 +95,22 @@ def main():
         print("\n🚀 Launching application with authentication...")
         print("🌐 App will open at: http://localhost:8501")
         print("🎮 Demo Mode: Use admin@disaster.com / admin123 to login")
-        print("\n📝 Note: Press Ctrl+C to stop the application")
-        time.sleep(2)
-        subprocess.run("streamlit run app_with_auth.py", shell=True)
+        print("\n📝 Note: Press Ctrl+C to stop the application", flush=True)
+        launch_streamlit("app_with_auth.py")
     
     elif choice == "2":
         print("\n🚀 Launching basic application...")
         print("🌐 App will open at: http://localhost:8501")
-        print("\n📝 Note: Press Ctrl+C to stop the application")
-        time.sleep(2)
-        subprocess.run("streamlit run app.py", shell=True)
+        print("\n📝 Note: Press Ctrl+C to stop the application", flush=True)
+        launch_streamlit("app.py")
     
     elif choice == "3":
         print("\n📋 Displaying Supabase SQL Schema...")
-        run_command("python src/auth.py", "Showing SQL Schema")
+        # Import in-process rather than spawning another interpreter
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+        from auth import get_schema
+        print("=" * 50)
+        print(get_schema())
     
     elif choice == "4":
         print("\n👋 Goodbye!")
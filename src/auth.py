@@ -5,31 +5,52 @@ Handles user signup, login, session management, and database operations.
 
 import streamlit as st
 import os
-from supabase import create_client, Client
 import hashlib
+import hmac
 import json
+import time
 from datetime import datetime, timedelta
 import re
-from dotenv import load_dotenv
+from functools import lru_cache
+from pathlib import Path
+
+@lru_cache(maxsize=1)
+def _load_env():
+    """Load environment variables from .env once per process."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return True
 
 # Load environment variables
-load_dotenv()
+_load_env()
 
 # Supabase configuration - Try Streamlit secrets first, then environment variables
-try:
-    SUPABASE_URL = st.secrets.get("SUPABASE_URL", os.getenv("SUPABASE_URL", "YOUR_SUPABASE_PROJECT_URL"))
-    SUPABASE_KEY = st.secrets.get("SUPABASE_ANON_KEY", os.getenv("SUPABASE_ANON_KEY", "YOUR_SUPABASE_ANON_KEY"))
-    DEMO_MODE = str(st.secrets.get("DEMO_MODE", os.getenv("DEMO_MODE", "true"))).lower() == "true"
-except:
-    SUPABASE_URL = os.getenv("SUPABASE_URL", "YOUR_SUPABASE_PROJECT_URL")
-    SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY", "YOUR_SUPABASE_ANON_KEY")
-    DEMO_MODE = os.getenv("DEMO_MODE", "true").lower() == "true"
+# (probe once for a secrets file instead of letting st.secrets raise)
+_has_secrets = hasattr(st, 'secrets') and st.secrets.load_if_toml_exists()
+_secrets = st.secrets if _has_secrets else {}
+
+SUPABASE_URL = _secrets.get("SUPABASE_URL") or os.getenv("SUPABASE_URL", "YOUR_SUPABASE_PROJECT_URL")
+SUPABASE_KEY = _secrets.get("SUPABASE_ANON_KEY") or os.getenv("SUPABASE_ANON_KEY", "YOUR_SUPABASE_ANON_KEY")
+# Secrets may hold a TOML boolean, so stringify before checking the first character
+_raw_demo_mode = _secrets.get("DEMO_MODE", os.getenv("DEMO_MODE", "true"))
+DEMO_MODE = str(_raw_demo_mode)[:1] in ("t", "T", "1", "y", "Y")
+
+# Bytes of random salt stored in front of each demo-mode password hash
+_SALT_SIZE = 16
+
+# Email pattern, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Maps '@' and '.' to '_' when deriving placeholder ids from emails
+_ID_TRANS = str.maketrans({'@': '_', '.': '_'})
 
 class SupabaseAuth:
     def __init__(self, url: str = None, key: str = None):
         """Initialize Supabase client."""
         self.supabase_url = url or SUPABASE_URL
         self.supabase_key = key or SUPABASE_KEY
+        # Emails already registered in this browser session, to reject repeat signups without a round-trip
+        self._recent_signups = set()
         
         # Check if we should use demo mode
         if DEMO_MODE or self.supabase_url == "YOUR_SUPABASE_PROJECT_URL" or self.supabase_key == "YOUR_SUPABASE_ANON_KEY":
@@ -39,7 +60,9 @@ class SupabaseAuth:
             print("🎮 Running in DEMO MODE - No Supabase required")
         else:
             try:
-                self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+                # Imported lazily so demo mode never loads the Supabase client stack
+                from supabase import create_client
+                self.supabase = create_client(self.supabase_url, self.supabase_key)
                 self.demo_mode = False
                 print("🔗 Connected to Supabase successfully")
             except Exception as e:
@@ -51,35 +74,51 @@ class SupabaseAuth:
     
     def _init_demo_users(self):
         """Initialize demo users for testing without Supabase."""
+        defaults = _default_demo_users()
         self.demo_users = {
-            "admin@disaster.com": {
-                "password_hash": self._hash_password("admin123"),
-                "created_at": datetime.now().isoformat(),
-                "role": "admin"
-            },
-            "user@disaster.com": {
-                "password_hash": self._hash_password("user123"),
-                "created_at": datetime.now().isoformat(),
-                "role": "user"
-            }
+            email: {"created_at": created_at, "role": role}
+            for email, (_, role, created_at) in defaults.items()
+        }
+        # Password hashes kept flat (email -> salt + digest) for the login hot path
+        self.demo_hashes: dict[str, bytes] = {
+            email: password_hash for email, (password_hash, _, _) in defaults.items()
         }
     
-    def _hash_password(self, password: str) -> str:
-        """Hash password using SHA-256."""
-        return hashlib.sha256(password.encode()).hexdigest()
+    @staticmethod
+    def _hash_password(password: str, salt: bytes = None) -> bytes:
+        """Hash password using scrypt with a per-user salt; returns salt + digest."""
+        if salt is None:
+            salt = os.urandom(_SALT_SIZE)
+        return salt + hashlib.scrypt(password.encode('utf-8'), salt=salt, n=2**14, r=8, p=1, dklen=32)
+    
+    @classmethod
+    def _check_password(cls, password: str, stored_hash: bytes) -> bool:
+        """Check a password against a stored salt + digest in constant time."""
+        return hmac.compare_digest(stored_hash, cls._hash_password(password, stored_hash[:_SALT_SIZE]))
     
-    def _validate_email(self, email: str) -> bool:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _validate_email(email: str) -> bool:
         """Validate email format."""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return _EMAIL_RE.match(email) is not None
     
     def _validate_password(self, password: str) -> tuple[bool, str]:
         """Validate password strength."""
         if len(password) < 6:
             return False, "Password must be at least 6 characters long"
-        if not re.search(r'[A-Za-z]', password):
+        # Single pass over the characters (ASCII only, matching the old [A-Za-z] / [0-9] checks)
+        has_alpha = has_digit = False
+        for c in password:
+            if c.isascii():
+                if c.isalpha():
+                    has_alpha = True
+                elif c.isdigit():
+                    has_digit = True
+                if has_alpha and has_digit:
+                    break
+        if not has_alpha:
             return False, "Password must contain at least one letter"
-        if not re.search(r'[0-9]', password):
+        if not has_digit:
             return False, "Password must contain at least one number"
         return True, "Password is valid"
     
@@ -110,15 +149,18 @@ class SupabaseAuth:
             return False, "User already exists"
         
         self.demo_users[email] = {
-            "password_hash": self._hash_password(password),
             "created_at": datetime.now().isoformat(),
             "role": "user"
         }
+        self.demo_hashes[email] = self._hash_password(password)
         
         return True, "User created successfully in demo mode"
     
     def _signup_supabase_user(self, email: str, password: str) -> tuple[bool, str]:
         """Sign up user using Supabase Auth."""
+        if email in self._recent_signups:
+            return False, "An account with this email already exists. Please try logging in."
+        
         try:
             # Sign up with Supabase Auth
             auth_response = self.supabase.auth.sign_up({
@@ -127,16 +169,8 @@ class SupabaseAuth:
             })
             
             if auth_response.user:
-                # Insert additional user data into custom users table
-                user_data = {
-                    "id": auth_response.user.id,
-                    "email": email,
-                    "created_at": datetime.now().isoformat(),
-                    "role": "user"
-                }
-                
-                self.supabase.table("users").insert(user_data).execute()
-                
+                self._recent_signups.add(email)
+                # The on_auth_user_created trigger fills in the custom users table
                 return True, "Account created successfully! Please check your email and click the confirmation link before logging in."
             else:
                 return False, "Failed to create user"
@@ -144,6 +178,7 @@ class SupabaseAuth:
         except Exception as e:
             error_msg = str(e)
             if "User already registered" in error_msg:
+                self._recent_signups.add(email)
                 return False, "An account with this email already exists. Please try logging in."
             else:
                 return False, f"Signup error: {error_msg}"
@@ -160,13 +195,11 @@ class SupabaseAuth:
     
     def _login_demo_user(self, email: str, password: str) -> tuple[bool, str, dict]:
         """Login user in demo mode."""
-        if email not in self.demo_users:
+        stored_hash = self.demo_hashes.get(email)
+        if stored_hash is None:
             return False, "User not found", {}
         
-        stored_hash = self.demo_users[email]["password_hash"]
-        input_hash = self._hash_password(password)
-        
-        if stored_hash == input_hash:
+        if self._check_password(password, stored_hash):
             user_data = {
                 "email": email,
                 "role": self.demo_users[email]["role"],
@@ -193,14 +226,22 @@ class SupabaseAuth:
                     "demo_mode": False,
                     "email_confirmed": True  # Always set as confirmed for development
                 }
+                if auth_response.session and auth_response.session.expires_at:
+                    user_data["expires_at"] = auth_response.session.expires_at
                 
-                # Get additional user data from custom users table
-                try:
-                    user_response = self.supabase.table("users").select("*").eq("email", email).execute()
-                    if user_response.data:
-                        user_data.update(user_response.data[0])
-                except Exception:
-                    pass  # Continue even if users table query fails
+                # Get additional user data from custom users table (one RPC, cached per session)
+                profile_cache = st.session_state.setdefault('profile_cache', {})
+                profile = profile_cache.get(auth_response.user.id)
+                if profile is None:
+                    try:
+                        profile_response = self.supabase.rpc("login_with_profile", {"p_email": email}).execute()
+                        if profile_response.data:
+                            profile = profile_response.data
+                            profile_cache[auth_response.user.id] = profile
+                    except Exception:
+                        pass  # Continue even if users table query fails
+                if profile:
+                    user_data.update(profile)
                 
                 return True, "Login successful", user_data
             else:
@@ -218,7 +259,7 @@ class SupabaseAuth:
                         "email": email,
                         "demo_mode": False,
                         "email_confirmed": False,
-                        "id": f"unconfirmed_{email.replace('@', '_').replace('.', '_')}"
+                        "id": f"unconfirmed_{email.translate(_ID_TRANS)}"
                     }
                     return True, "Login successful (Development mode - email confirmation bypassed)", user_data
                 except:
@@ -244,6 +285,8 @@ class SupabaseAuth:
     
     def logout_user(self) -> tuple[bool, str]:
         """Logout current user."""
+        # Drop the stored identity even if sign_out fails, so get_current_user stops trusting it
+        st.session_state.pop('user_data', None)
         if self.demo_mode:
             return True, "Logged out successfully"
         else:
@@ -258,22 +301,44 @@ class SupabaseAuth:
         if self.demo_mode:
             return st.session_state.get('user_data', {})
         else:
+            # Trust the stored session until shortly before the JWT expires
+            user_data = st.session_state.get('user_data', {})
+            if time.time() < user_data.get('expires_at', 0) - 60:
+                return user_data
             try:
                 user = self.supabase.auth.get_user()
                 if user:
                     return {"id": user.user.id, "email": user.user.email}
                 return {}
-            except:
+            except Exception:
                 return {}
 
+def _session_auth():
+    """Return this session's SupabaseAuth, creating it on first use.
+    
+    The instance holds the signed-in Supabase session and demo signups, so it is never
+    shared between sessions; only the demo-account hashes below are process-wide.
+    """
+    if 'auth_instance' not in st.session_state:
+        st.session_state.auth_instance = SupabaseAuth()
+    return st.session_state.auth_instance
+
+@lru_cache(maxsize=1)
+def _default_demo_users():
+    """Hash the built-in demo accounts once per process: {email: (hash, role, created_at)}."""
+    created_at = datetime.now().isoformat()
+    return {
+        "admin@disaster.com": (SupabaseAuth._hash_password("admin123"), "admin", created_at),
+        "user@disaster.com": (SupabaseAuth._hash_password("user123"), "user", created_at)
+    }
+
 def init_session_state():
     """Initialize session state variables."""
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
     if 'user_data' not in st.session_state:
         st.session_state.user_data = {}
-    if 'auth_instance' not in st.session_state:
-        st.session_state.auth_instance = SupabaseAuth()
+    _session_auth()
 
 def show_login_page():
     """Display login page."""
@@ -380,9 +445,9 @@ def show_user_info():
         
         if st.sidebar.button("🚪 Logout"):
             success, message = st.session_state.auth_instance.logout_user()
+            st.session_state.authenticated = False
+            st.session_state.user_data = {}
             if success:
-                st.session_state.authenticated = False
-                st.session_state.user_data = {}
                 st.rerun()
             else:
                 st.sidebar.error(message)
@@ -405,123 +470,23 @@ def require_authentication(app_function):
     
     return wrapper
 
-# SQL Schema for Supabase
-SUPABASE_SQL_SCHEMA = """
--- SQL Schema for Disaster Relief Resource Optimizer
--- Paste this into your Supabase SQL Editor
-
--- Enable RLS (Row Level Security)
-ALTER TABLE IF EXISTS users ENABLE ROW LEVEL SECURITY;
-
--- Create users table for additional user data
-CREATE TABLE IF NOT EXISTS users (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    email TEXT UNIQUE NOT NULL,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    role TEXT DEFAULT 'user' CHECK (role IN ('user', 'admin')),
-    full_name TEXT,
-    organization TEXT,
-    last_login TIMESTAMP WITH TIME ZONE
-);
-
--- Create predictions table to store ML predictions
-CREATE TABLE IF NOT EXISTS predictions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
-    disaster_type TEXT NOT NULL,
-    state TEXT,
-    district TEXT,
-    people_affected INTEGER,
-    deaths INTEGER,
-    damages BIGINT,
-    predicted_severity TEXT CHECK (predicted_severity IN ('Low', 'Medium', 'High')),
-    prediction_confidence JSONB,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
-
--- Create resource_allocations table to store allocation results
-CREATE TABLE IF NOT EXISTS resource_allocations (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    prediction_id UUID REFERENCES predictions(id) ON DELETE CASCADE,
-    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
-    food_kits_allocated INTEGER DEFAULT 0,
-    water_packs_allocated INTEGER DEFAULT 0,
-    medicine_kits_allocated INTEGER DEFAULT 0,
-    shelter_units_allocated INTEGER DEFAULT 0,
-    fulfillment_rate DECIMAL(5,2),
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
-
--- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-CREATE INDEX IF NOT EXISTS idx_predictions_user_id ON predictions(user_id);
-CREATE INDEX IF NOT EXISTS idx_predictions_created_at ON predictions(created_at);
-CREATE INDEX IF NOT EXISTS idx_resource_allocations_user_id ON resource_allocations(user_id);
-
--- RLS Policies
--- Users can only see their own data
-CREATE POLICY "Users can view own data" ON users
-    FOR SELECT USING (auth.uid() = id);
-
-CREATE POLICY "Users can update own data" ON users
-    FOR UPDATE USING (auth.uid() = id);
-
--- Predictions policies
-CREATE POLICY "Users can view own predictions" ON predictions
-    FOR SELECT USING (auth.uid() = user_id);
-
-CREATE POLICY "Users can insert own predictions" ON predictions
-    FOR INSERT WITH CHECK (auth.uid() = user_id);
-
--- Resource allocations policies
-CREATE POLICY "Users can view own allocations" ON resource_allocations
-    FOR SELECT USING (auth.uid() = user_id);
-
-CREATE POLICY "Users can insert own allocations" ON resource_allocations
-    FOR INSERT WITH CHECK (auth.uid() = user_id);
-
--- Function to automatically set updated_at timestamp
-CREATE OR REPLACE FUNCTION update_updated_at_column()
-RETURNS TRIGGER AS $$
-BEGIN
-    NEW.updated_at = NOW();
-    RETURN NEW;
-END;
-$$ language 'plpgsql';
-
--- Trigger to automatically update updated_at
-CREATE TRIGGER update_users_updated_at 
-    BEFORE UPDATE ON users 
-    FOR EACH ROW 
-    EXECUTE FUNCTION update_updated_at_column();
-
--- Insert default admin user (optional)
--- INSERT INTO users (email, role, full_name) 
--- VALUES ('admin@disaster.com', 'admin', 'System Administrator')
--- ON CONFLICT (email) DO NOTHING;
-"""
-
-# Global instance for easy access
-_auth_instance = None
+# SQL Schema for Supabase (kept in schema.sql and read only when requested)
+def get_schema() -> str:
+    """Return the Supabase SQL schema."""
+    return (Path(__file__).parent / "schema.sql").read_text(encoding="utf-8")
 
 def get_supabase_client():
     """Get Supabase client instance for database operations."""
-    global _auth_instance
-    if _auth_instance is None:
-        _auth_instance = SupabaseAuth()
-    return _auth_instance.supabase if _auth_instance and not _auth_instance.demo_mode else None
+    auth = _session_auth()
+    return auth.supabase if not auth.demo_mode else None
 
 def get_auth_instance():
-    """Get the global SupabaseAuth instance."""
-    global _auth_instance
-    if _auth_instance is None:
-        _auth_instance = SupabaseAuth()
-    return _auth_instance
+    """Get the current session's SupabaseAuth instance."""
+    return _session_auth()
 
 if __name__ == "__main__":
     # Print SQL schema for easy copying
     print("=== SUPABASE SQL SCHEMA ===")
     print("Copy and paste the following SQL into your Supabase SQL Editor:")
     print("=" * 50)
-    print(SUPABASE_SQL_SCHEMA)
\ No newline at end of file
+    print(get_schema())
\ No newline at end of file
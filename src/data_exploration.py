@@ -9,6 +9,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 
+from data_preprocessing import read_dataset
+
 def download_kaggle_dataset():
     """
     Instructions for downloading the disaster dataset from Kaggle.
@@ -51,81 +53,82 @@ def create_sample_dataset():
     
     print("Creating sample disaster dataset...")
     
-    # Set random seed for reproducibility
-    np.random.seed(42)
+    # Seeded generator for reproducibility
+    rng = np.random.default_rng(42)
     
     # Define possible values
     disaster_types = ['flood', 'earthquake', 'cyclone', 'drought', 'landslide', 'wildfire', 'tsunami']
     states = ['California', 'Texas', 'Florida', 'New York', 'India', 'Japan', 'Philippines', 'Indonesia']
     districts = ['District A', 'District B', 'District C', 'District D', 'District E']
     
-    # Generate sample data
+    # Lognormal (mu_affected, mu_deaths, mu_damages, sigma) per disaster type, aligned with disaster_types
+    impact_params = np.array([
+        (7.0, 2.5, 14.0, 1.2),   # flood
+        (8.0, 3.0, 15.0, 1.5),   # earthquake - higher impact
+        (7.0, 2.5, 14.0, 1.2),   # cyclone
+        (6.5, 2.0, 13.0, 1.0),   # drought
+        (6.5, 2.0, 13.0, 1.0),   # landslide
+        (6.5, 2.0, 13.0, 1.0),   # wildfire
+        (8.0, 3.0, 15.0, 1.5)    # tsunami - higher impact
+    ])
+    
+    # Generate sample data, one vectorised draw per column
     n_samples = 1000
     
-    data = []
-    for i in range(n_samples):
-        # Random year between 2000 and 2023
-        year = np.random.randint(2000, 2024)
-        
-        # Random disaster type
-        disaster_type = np.random.choice(disaster_types)
-        
-        # Random location
-        state = np.random.choice(states)
-        district = np.random.choice(districts)
-        
-        # Generate realistic numbers based on disaster type
-        if disaster_type in ['earthquake', 'tsunami']:
-            people_affected = np.random.lognormal(8, 1.5)  # Higher impact
-            deaths = np.random.lognormal(3, 1.5)
-            damages = np.random.lognormal(15, 1.5)
-        elif disaster_type in ['flood', 'cyclone']:
-            people_affected = np.random.lognormal(7, 1.2)
-            deaths = np.random.lognormal(2.5, 1.2)
-            damages = np.random.lognormal(14, 1.2)
-        else:  # drought, landslide, wildfire
-            people_affected = np.random.lognormal(6.5, 1.0)
-            deaths = np.random.lognormal(2, 1.0)
-            damages = np.random.lognormal(13, 1.0)
-        
-        # Add some missing values randomly (10% chance)
-        if np.random.random() < 0.1:
-            deaths = np.nan
-        if np.random.random() < 0.05:
-            damages = np.nan
-        if np.random.random() < 0.03:
-            people_affected = np.nan
-        
-        data.append({
-            'year': year,
-            'disaster_type': disaster_type,
-            'state': state,
-            'district': district,
-            'people_affected': int(people_affected) if not pd.isna(people_affected) else np.nan,
-            'deaths': int(deaths) if not pd.isna(deaths) else np.nan,
-            'damages': int(damages) if not pd.isna(damages) else np.nan
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
+    type_idx = rng.integers(0, len(disaster_types), n_samples)
+    mu_affected, mu_deaths, mu_damages, sigma = impact_params[type_idx].T
+    
+    people_affected = rng.lognormal(mu_affected, sigma)
+    deaths = rng.lognormal(mu_deaths, sigma)
+    damages = rng.lognormal(mu_damages, sigma)
+    
+    # Add some missing values randomly, as nullable integer columns (values truncated like int())
+    # Damages can exceed the int32 range in the tail, so they use Int64
+    people_affected = pd.arrays.IntegerArray(people_affected.astype(np.int32), rng.random(n_samples) < 0.03)
+    deaths = pd.arrays.IntegerArray(deaths.astype(np.int32), rng.random(n_samples) < 0.1)
+    damages = pd.arrays.IntegerArray(damages.astype(np.int64), rng.random(n_samples) < 0.05)
+    
+    # Create DataFrame straight from the column arrays (no copies)
+    df = pd.DataFrame({
+        'year': rng.integers(2000, 2024, n_samples).astype(np.int16),
+        'disaster_type': pd.Categorical.from_codes(type_idx, disaster_types),
+        'state': pd.Categorical.from_codes(rng.integers(0, len(states), n_samples), states),
+        'district': pd.Categorical.from_codes(rng.integers(0, len(districts), n_samples), districts),
+        'people_affected': people_affected,
+        'deaths': deaths,
+        'damages': damages
+    }, copy=False)
     
     # Save to CSV
     output_path = 'data/disaster_data.csv'
     os.makedirs('data', exist_ok=True)
     df.to_csv(output_path, index=False)
     
+    # Columnar copy for faster reloads (needs pyarrow or fastparquet)
+    try:
+        df.to_parquet('data/disaster_data.parquet', compression='zstd', index=False)
+    except ImportError:
+        pass
+    
     print(f"Sample dataset created: {output_path}")
     print(f"Dataset shape: {df.shape}")
     
     return df
 
-def explore_dataset(file_path):
+def _category_counts(series):
+    """Count category occurrences from categorical codes, most frequent first."""
+    categorical = series.astype('category')
+    codes = categorical.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(categorical.cat.categories))
+    return pd.Series(counts, index=categorical.cat.categories, name='count').sort_values(ascending=False)
+
+def explore_dataset(file_path, use_arrow=False, verbose=False):
     """Explore the disaster dataset and generate insights."""
     
     print(f"Loading dataset from: {file_path}")
     
     try:
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path, use_arrow=use_arrow)
     except FileNotFoundError:
         print("Dataset not found. Creating sample dataset...")
         df = create_sample_dataset()
@@ -138,39 +141,45 @@ def explore_dataset(file_path):
     print(f"\nDataset Shape: {df.shape}")
     print(f"Columns: {list(df.columns)}")
     
-    # Data types and missing values
-    print("\nData Types and Missing Values:")
-    print(df.info())
+    # Data types and missing values (df.info() walks every column, so only on request)
+    if verbose:
+        print("\nData Types and Missing Values:")
+        df.info()
     
-    # Statistical summary
+    # Statistical summary, computed once and reused below
     print("\nStatistical Summary:")
-    print(df.describe())
+    summary = df.select_dtypes('number').agg(['count', 'mean', 'std', 'min', 'max'])
+    print(summary)
     
     # Missing values analysis
     print("\nMissing Values Count:")
-    missing_values = df.isnull().sum()
+    missing_values = df.isna().sum()
     print(missing_values[missing_values > 0])
     
     # Categorical variables analysis
     print("\nDisaster Types Distribution:")
     if 'disaster_type' in df.columns:
-        print(df['disaster_type'].value_counts())
+        print(_category_counts(df['disaster_type']))
     
     print("\nStates Distribution (top 10):")
     if 'state' in df.columns:
-        print(df['state'].value_counts().head(10))
+        print(_category_counts(df['state']).head(10))
     
     # Numerical variables analysis
     numerical_cols = ['year', 'people_affected', 'deaths', 'damages']
-    available_numerical = [col for col in numerical_cols if col in df.columns]
+    available_numerical = [col for col in numerical_cols if col in summary.columns]
     
     if available_numerical:
         print(f"\nNumerical Variables Summary:")
-        print(df[available_numerical].describe())
+        print(summary[available_numerical])
     
     # Year analysis
     if 'year' in df.columns:
-        print(f"\nYear Range: {df['year'].min()} - {df['year'].max()}")
+        if 'year' in summary.columns:
+            print(f"\nYear Range: {summary['year']['min']:.0f} - {summary['year']['max']:.0f}")
+        else:
+            # Non-numeric year column, not part of the numeric summary
+            print(f"\nYear Range: {df['year'].min()} - {df['year'].max()}")
         print("Disasters by Year (top 10):")
         print(df['year'].value_counts().head(10))
     
@@ -207,7 +216,9 @@ def visualize_dataset(df):
     if 'people_affected' in df.columns:
         people_affected_clean = df['people_affected'].dropna()
         if len(people_affected_clean) > 0:
-            axes[1, 0].hist(np.log10(people_affected_clean + 1), bins=30, alpha=0.7)
+            # Bin with NumPy and draw the bars directly
+            counts, edges = np.histogram(np.log10(people_affected_clean + 1), bins=30)
+            axes[1, 0].bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.7)
             axes[1, 0].set_title('People Affected Distribution (log scale)')
             axes[1, 0].set_xlabel('Log10(People Affected + 1)')
             axes[1, 0].set_ylabel('Frequency')
@@ -216,12 +227,12 @@ def visualize_dataset(df):
     if 'deaths' in df.columns and 'people_affected' in df.columns:
         clean_data = df[['deaths', 'people_affected']].dropna()
         if len(clean_data) > 0:
-            axes[1, 1].scatter(clean_data['people_affected'], clean_data['deaths'], alpha=0.6)
+            # Hexbin density instead of one marker per row (+1 keeps zero counts on the log axes)
+            axes[1, 1].hexbin(clean_data['people_affected'] + 1, clean_data['deaths'] + 1, gridsize=60,
+                              xscale='log', yscale='log', bins='log', mincnt=1)
             axes[1, 1].set_title('Deaths vs People Affected')
             axes[1, 1].set_xlabel('People Affected')
             axes[1, 1].set_ylabel('Deaths')
-            axes[1, 1].set_xscale('log')
-            axes[1, 1].set_yscale('log')
     
     plt.tight_layout()
     
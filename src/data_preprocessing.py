@@ -5,25 +5,79 @@ Handles data cleaning, feature engineering, and preparation for ML model.
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 import warnings
 warnings.filterwarnings('ignore')
 
+# Optional Numba kernel for severity scoring; the NumPy path below is used without it
+try:
+    from numba import config as numba_config, njit, prange
+    
+    # Under NUMBA_DISABLE_JIT=1 the kernels would run as plain Python loops; take the NumPy paths instead
+    if numba_config.DISABLE_JIT:
+        raise ImportError("Numba JIT is disabled")
+    
+    @njit(parallel=True, cache=True)
+    def _severity_score_kernel(deaths, affected, damages, thresholds, out):
+        for i in prange(out.shape[0]):
+            out[i] = (3 + (deaths[i] >= thresholds[0]) + (deaths[i] >= thresholds[1])
+                      + (affected[i] >= thresholds[2]) + (affected[i] >= thresholds[3])
+                      + (damages[i] >= thresholds[4]) + (damages[i] >= thresholds[5]))
+    
+    # Explicit signature compiles at import, so the first dashboard prediction pays no JIT cost
+    @njit('f8[:](f8[:], f8[:], f8[:])', cache=True)
+    def _scale_row_kernel(values, offsets, scales):
+        return (values - offsets) / scales
+except ImportError:
+    _severity_score_kernel = None
+    _scale_row_kernel = None
+
+# Code given to categories that were not seen during fitting (fitted codes start at 0)
+UNSEEN_CATEGORY_CODE = -1
+
+def read_dataset(file_path, use_arrow=False, columns=None, block_size=32 << 20):
+    """Read a Parquet or CSV dataset, using the pyarrow CSV reader when requested and installed.
+    
+    block_size is the number of bytes pyarrow parses per block (larger blocks mean fewer reads).
+    """
+    if str(file_path).endswith('.parquet'):
+        return pd.read_parquet(file_path, columns=columns)
+    if use_arrow:
+        try:
+            from pyarrow import csv as pacsv
+        except ImportError:
+            pass  # pyarrow not installed, fall back to the default C parser
+        else:
+            table = pacsv.read_csv(
+                file_path,
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=block_size),
+                convert_options=pacsv.ConvertOptions(include_columns=columns) if columns else None
+            )
+            return table.to_pandas()
+    return pd.read_csv(file_path, usecols=columns)
+
 class DisasterDataPreprocessor:
-    def __init__(self):
-        self.label_encoders = {}
+    def __init__(self, use_sklearn_scaler=False):
+        self.cat_maps = {}
+        self.feature_names_ = None
+        # Inline (x - mean) / std by default; use_sklearn_scaler keeps the StandardScaler path
+        self.use_sklearn_scaler = use_sklearn_scaler
         self.scaler = StandardScaler()
+        self.scaled_cols_ = None
+        self.means_ = None
+        self.stds_ = None
+        self._input_plan_ = None
         self.severity_thresholds = {
             'deaths': {'low': 10, 'medium': 100},
             'affected': {'low': 1000, 'medium': 10000},
             'damages': {'low': 1000000, 'medium': 10000000}  # in currency units
         }
     
-    def load_data(self, file_path):
-        """Load disaster dataset from CSV file."""
+    def load_data(self, file_path, use_arrow=False, block_size=32 << 20):
+        """Load disaster dataset from a CSV or Parquet file (use_arrow opts into the multithreaded pyarrow parser)."""
         try:
-            df = pd.read_csv(file_path)
+            df = read_dataset(file_path, use_arrow=use_arrow, block_size=block_size)
             print(f"Dataset loaded successfully. Shape: {df.shape}")
             return df
         except Exception as e:
@@ -34,31 +88,30 @@ class DisasterDataPreprocessor:
         """Handle missing values and data inconsistencies."""
         print("Cleaning data...")
         
-        # Make a copy to avoid modifying original
-        df_clean = df.copy()
-        
         # Convert column names to lowercase and replace spaces with underscores
-        df_clean.columns = df_clean.columns.str.lower().str.replace(' ', '_')
+        # (rename returns a new frame, so the original is left untouched)
+        df_clean = df.rename(columns=lambda col: col.lower().replace(' ', '_'))
         
-        # Handle missing values for numerical columns
-        numerical_cols = ['deaths', 'people_affected', 'damages']
-        for col in numerical_cols:
-            if col in df_clean.columns:
-                # Fill missing values with median
-                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
-                df_clean[col].fillna(df_clean[col].median(), inplace=True)
+        numerical_cols = [col for col in ['deaths', 'people_affected', 'damages'] if col in df_clean.columns]
+        categorical_cols = [col for col in ['disaster_type', 'state', 'district'] if col in df_clean.columns]
+        critical_cols = [col for col in ['year', 'disaster_type'] if col in df_clean.columns]
         
-        # Handle missing values for categorical columns
-        categorical_cols = ['disaster_type', 'state', 'district']
+        if numerical_cols:
+            df_clean[numerical_cols] = df_clean[numerical_cols].apply(pd.to_numeric, errors='coerce')
+        
+        # Categoricals (e.g. from Parquet) only accept 'Unknown' once it is one of their categories
         for col in categorical_cols:
-            if col in df_clean.columns:
-                df_clean[col].fillna('Unknown', inplace=True)
+            if isinstance(df_clean[col].dtype, pd.CategoricalDtype) and 'Unknown' not in df_clean[col].cat.categories:
+                df_clean[col] = df_clean[col].cat.add_categories('Unknown')
+        
+        # Fill numerical gaps with medians and categorical gaps with 'Unknown' in a single pass
+        fill_map = df_clean[numerical_cols].median().to_dict()
+        fill_map.update(dict.fromkeys(categorical_cols, 'Unknown'))
+        df_clean = df_clean.fillna(fill_map)
         
         # Remove rows with critical missing information
-        critical_cols = ['year', 'disaster_type']
-        for col in critical_cols:
-            if col in df_clean.columns:
-                df_clean = df_clean.dropna(subset=[col])
+        if critical_cols:
+            df_clean = df_clean.dropna(subset=critical_cols)
         
         print(f"Data cleaned. Final shape: {df_clean.shape}")
         return df_clean
@@ -67,87 +120,85 @@ class DisasterDataPreprocessor:
         """Create disaster severity labels based on deaths, affected people, and damages."""
         print("Creating severity labels...")
         
-        severity_scores = []
-        
-        for _, row in df.iterrows():
-            score = 0
-            
-            # Score based on deaths
-            deaths = row.get('deaths', 0)
-            if deaths >= self.severity_thresholds['deaths']['medium']:
-                score += 3
-            elif deaths >= self.severity_thresholds['deaths']['low']:
-                score += 2
-            else:
-                score += 1
-            
-            # Score based on people affected
-            affected = row.get('people_affected', 0)
-            if affected >= self.severity_thresholds['affected']['medium']:
-                score += 3
-            elif affected >= self.severity_thresholds['affected']['low']:
-                score += 2
-            else:
-                score += 1
-            
-            # Score based on damages
-            damages = row.get('damages', 0)
-            if damages >= self.severity_thresholds['damages']['medium']:
-                score += 3
-            elif damages >= self.severity_thresholds['damages']['low']:
-                score += 2
-            else:
-                score += 1
-            
-            severity_scores.append(score)
+        def column(name):
+            if name in df.columns:
+                return df[name].to_numpy(dtype=np.float64)
+            return np.zeros(len(df))
+        
+        def points(values, thresholds):
+            # 3 points at or above 'medium', 2 at or above 'low', otherwise 1 (NaN scores 1)
+            low, medium = thresholds['low'], thresholds['medium']
+            return np.where(values >= medium, 3, np.where(values >= low, 2, 1))
+        
+        deaths, affected, damages = column('deaths'), column('people_affected'), column('damages')
+        
+        if _severity_score_kernel is not None:
+            t = self.severity_thresholds
+            thresholds = np.array([
+                t['deaths']['low'], t['deaths']['medium'],
+                t['affected']['low'], t['affected']['medium'],
+                t['damages']['low'], t['damages']['medium']
+            ], dtype=np.float64)
+            severity_scores = np.empty(len(df), dtype=np.int64)
+            _severity_score_kernel(deaths, affected, damages, thresholds, severity_scores)
+        else:
+            severity_scores = (
+                points(deaths, self.severity_thresholds['deaths'])
+                + points(affected, self.severity_thresholds['affected'])
+                + points(damages, self.severity_thresholds['damages'])
+            )
         
         # Convert scores to labels
-        severity_labels = []
-        for score in severity_scores:
-            if score >= 7:
-                severity_labels.append('High')
-            elif score >= 5:
-                severity_labels.append('Medium')
-            else:
-                severity_labels.append('Low')
+        severity_labels = np.select([severity_scores >= 7, severity_scores >= 5], ['High', 'Medium'], default='Low')
         
-        df['severity'] = severity_labels
-        print(f"Severity distribution:\n{pd.Series(severity_labels).value_counts()}")
+        # Ordered categorical: int8 codes instead of one string object per row
+        df['severity'] = pd.Categorical(severity_labels, categories=['Low', 'Medium', 'High'], ordered=True)
+        print(f"Severity distribution:\n{df['severity'].value_counts()}")
         return df
     
     def encode_categorical_features(self, df, fit=True):
-        """Encode categorical variables using label encoding."""
+        """Encode categorical variables as integer category codes."""
         print("Encoding categorical features...")
         
         df_encoded = df.copy()
         categorical_cols = ['disaster_type', 'state', 'district']
         
+        if fit:
+            self.cat_maps = {}
+            self._input_plan_ = None
+        cat_maps = self._get_cat_maps()
+        
         for col in categorical_cols:
             if col in df_encoded.columns:
                 if fit:
-                    # Fit new encoder
-                    self.label_encoders[col] = LabelEncoder()
-                    df_encoded[col] = self.label_encoders[col].fit_transform(df_encoded[col].astype(str))
-                else:
-                    # Use existing encoder
-                    if col in self.label_encoders:
-                        # Handle unseen categories
-                        unique_values = set(df_encoded[col].astype(str))
-                        known_values = set(self.label_encoders[col].classes_)
-                        unseen_values = unique_values - known_values
-                        
-                        if unseen_values:
-                            # Map unseen values to a default category
-                            df_encoded[col] = df_encoded[col].astype(str).apply(
-                                lambda x: x if x in known_values else 'Unknown'
-                            )
-                        
-                        df_encoded[col] = self.label_encoders[col].transform(df_encoded[col].astype(str))
+                    # Sorted categories give the same codes LabelEncoder used to
+                    categories = df_encoded[col].astype(str).astype('category')
+                    cat_maps[col] = {value: code for code, value in enumerate(categories.cat.categories)}
+                    df_encoded[col] = categories.cat.codes.astype('int32')
+                elif col in cat_maps:
+                    # Unseen values get the sentinel code
+                    df_encoded[col] = df_encoded[col].astype(str).map(cat_maps[col]).fillna(UNSEEN_CATEGORY_CODE).astype('int32')
         
         return df_encoded
     
+    def _scaling_params(self):
+        """Return (columns, means, stds) from the inline scaler, or from a fitted StandardScaler (older pickles)."""
+        if getattr(self, 'means_', None) is not None:
+            return self.scaled_cols_, self.means_, self.stds_
+        if hasattr(self.scaler, 'mean_'):
+            return list(getattr(self.scaler, 'feature_names_in_', [])), self.scaler.mean_, self.scaler.scale_
+        return [], None, None
+    
+    def _get_cat_maps(self):
+        """Return the category code maps, rebuilding them for preprocessors pickled with LabelEncoders."""
+        if not getattr(self, 'cat_maps', None):
+            self.cat_maps = {}
+            for col, encoder in getattr(self, 'label_encoders', {}).items():
+                self.cat_maps[col] = {value: code for code, value in enumerate(encoder.classes_)}
+        return self.cat_maps
+    
     def normalize_features(self, df, fit=True):
-        """Normalize numerical features using StandardScaler."""
+        """Normalize numerical features to zero mean and unit variance."""
         print("Normalizing numerical features...")
         
         df_normalized = df.copy()
@@ -158,9 +209,26 @@ class DisasterDataPreprocessor:
         
         if available_cols:
             if fit:
-                df_normalized[available_cols] = self.scaler.fit_transform(df_normalized[available_cols])
+                self._input_plan_ = None
+            if getattr(self, 'use_sklearn_scaler', True):
+                if fit:
+                    scaled = self.scaler.fit_transform(df_normalized[available_cols])
+                else:
+                    scaled = self.scaler.transform(df_normalized[available_cols])
             else:
-                df_normalized[available_cols] = self.scaler.transform(df_normalized[available_cols])
+                # Same statistics as StandardScaler (NaN-aware, population std, zero std -> 1) without its validation
+                values = df_normalized[available_cols].to_numpy(dtype=np.float64)
+                if fit:
+                    self.scaled_cols_ = available_cols
+                    self.means_ = np.nanmean(values, axis=0)
+                    stds = np.nanstd(values, axis=0)
+                    stds[stds == 0] = 1.0
+                    self.stds_ = stds
+                scaled_cols, means, stds = self._scaling_params()
+                idx = [scaled_cols.index(col) for col in available_cols]
+                scaled = (values - means[idx]) / stds[idx]
+            # float32 is plenty for scaled features and halves the bytes fed to the model
+            df_normalized[available_cols] = scaled.astype(np.float32)
         
         return df_normalized
     
@@ -172,7 +240,8 @@ class DisasterDataPreprocessor:
         feature_cols = ['year', 'disaster_type', 'state', 'district', 'people_affected', 'deaths', 'damages']
         available_features = [col for col in feature_cols if col in df.columns]
         
-        X = df[available_features]
+        # One uniform float32 block (keeps column names for the model's feature names)
+        X = df[available_features].astype(np.float32)
         y = df['severity']
         
         print(f"Features shape: {X.shape}")
@@ -205,31 +274,68 @@ class DisasterDataPreprocessor:
         # Prepare features and target
         X, y = self.prepare_features_and_target(df_normalized)
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=random_state, stratify=y
+        # Split contiguous arrays rather than DataFrames (severity split on its int8 codes)
+        self.feature_names_ = list(X.columns)
+        X_np = X.to_numpy(dtype=np.float32, copy=False)
+        y_codes = y.cat.codes.to_numpy(np.int8)
+        X_train, X_test, y_train_codes, y_test_codes = train_test_split(
+            X_np, y_codes, test_size=test_size, random_state=random_state, stratify=y_codes
         )
         
+        # Map codes back to labels so predictions stay 'Low'/'Medium'/'High'
+        labels = np.asarray(y.cat.categories, dtype=object)
+        y_train, y_test = labels[y_train_codes], labels[y_test_codes]
+        
         print("Data preprocessing completed successfully!")
         print(f"Training set: {X_train.shape}")
         print(f"Test set: {X_test.shape}")
         
         return X_train, X_test, y_train, y_test
     
+    def _single_input_plan(self):
+        """Fitted features in training order with per-feature (offset, scale) arrays.
+        
+        Categorical features use offset 0 and scale 1, so one (x - offset) / scale
+        pass assembles the whole row. Cached until the next fit.
+        """
+        plan = getattr(self, '_input_plan_', None)
+        if plan is None:
+            cat_maps = self._get_cat_maps()
+            scaled_cols, means, stds = self._scaling_params()
+            
+            # Features in the same order as training (only those the preprocessor was fitted on)
+            feature_cols = ['year', 'disaster_type', 'state', 'district', 'people_affected', 'deaths', 'damages']
+            features = [col for col in feature_cols if col in cat_maps or col in scaled_cols]
+            offsets = np.zeros(len(features))
+            scales = np.ones(len(features))
+            for i, col in enumerate(features):
+                if col not in cat_maps:
+                    j = scaled_cols.index(col)
+                    offsets[i] = means[j]
+                    scales[i] = stds[j]
+            plan = self._input_plan_ = (features, offsets, scales)
+        return plan
+    
     def preprocess_single_input(self, input_data):
-        """Preprocess a single input for prediction."""
-        # Convert input to DataFrame
-        df_input = pd.DataFrame([input_data])
-        
-        # Apply same preprocessing steps (without fitting)
-        df_encoded = self.encode_categorical_features(df_input, fit=False)
-        df_normalized = self.normalize_features(df_encoded, fit=False)
-        
-        # Select feature columns in the same order as training
-        feature_cols = ['year', 'disaster_type', 'state', 'district', 'people_affected', 'deaths', 'damages']
-        available_features = [col for col in feature_cols if col in df_normalized.columns]
-        
-        return df_normalized[available_features]
+        """Preprocess a single input dict for prediction as a 1 x n_features array."""
+        cat_maps = self._get_cat_maps()
+        features, offsets, scales = self._single_input_plan()
+        
+        values = np.empty(len(features), dtype=np.float64)
+        for i, col in enumerate(features):
+            value = input_data.get(col)
+            if col in cat_maps:
+                # Unseen values get the sentinel code
+                values[i] = cat_maps[col].get(str(value), UNSEEN_CATEGORY_CODE)
+            else:
+                values[i] = np.nan if value is None else float(value)
+        
+        # Apply the fitted scaling inline: (x - mean) / std
+        if _scale_row_kernel is not None:
+            row = _scale_row_kernel(values, offsets, scales)
+        else:
+            row = (values - offsets) / scales
+        return row.reshape(1, -1)
 
 if __name__ == "__main__":
     # Test the preprocessing pipeline
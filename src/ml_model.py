@@ -1,33 +1,56 @@
 """
 Machine Learning model module for disaster severity prediction.
-Implements Random Forest Classifier with model training and evaluation.
+Implements a histogram-based gradient boosting classifier with model training and evaluation.
 """
 
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.inspection import permutation_importance
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 import joblib
 import os
 
 class DisasterSeverityModel:
-    def __init__(self, n_estimators=100, random_state=42):
-        """Initialize Random Forest Classifier."""
-        self.model = RandomForestClassifier(
-            n_estimators=n_estimators,
-            random_state=random_state,
-            class_weight='balanced'  # Handle class imbalance
-        )
+    def __init__(self, max_iter=200, random_state=42, model_type='hist_gbdt', n_estimators=100):
+        """Initialize the classifier.
+        
+        model_type 'hist_gbdt' (default) uses HistGradientBoosting, which bins features into at most
+        255 buckets; 'random_forest' uses a Random Forest built and queried on all cores.
+        """
+        if model_type == 'hist_gbdt':
+            self.model = HistGradientBoostingClassifier(
+                max_iter=max_iter,
+                learning_rate=0.1,
+                max_bins=255,
+                early_stopping=True,
+                random_state=random_state,
+                class_weight='balanced'  # Handle class imbalance
+            )
+        elif model_type == 'random_forest':
+            self.model = RandomForestClassifier(
+                n_estimators=n_estimators,
+                random_state=random_state,
+                n_jobs=-1,
+                class_weight='balanced'  # Handle class imbalance
+            )
+        else:
+            raise ValueError(f"Unknown model_type: {model_type}")
+        self.model_type = model_type
+        self.random_state = random_state
         self.is_trained = False
+        self._pred_buf = None
         self.feature_names = None
         self.feature_importance = None
     
-    def train(self, X_train, y_train):
-        """Train the Random Forest model."""
-        print("Training Random Forest model...")
+    def train(self, X_train, y_train, feature_names=None):
+        """Train the model."""
+        print(f"Training {type(self.model).__name__} model...")
         
         # Store feature names
-        if hasattr(X_train, 'columns'):
+        if feature_names is not None:
+            self.feature_names = list(feature_names)
+        elif hasattr(X_train, 'columns'):
             self.feature_names = list(X_train.columns)
         else:
             self.feature_names = [f'feature_{i}' for i in range(X_train.shape[1])]
@@ -36,8 +59,14 @@ class DisasterSeverityModel:
         self.model.fit(X_train, y_train)
         self.is_trained = True
         
-        # Calculate feature importance
-        self.feature_importance = dict(zip(self.feature_names, self.model.feature_importances_))
+        # Calculate feature importance (HistGradientBoosting has no feature_importances_)
+        if hasattr(self.model, 'feature_importances_'):
+            importances = self.model.feature_importances_
+        else:
+            importances = permutation_importance(
+                self.model, X_train, y_train, n_repeats=5, random_state=self.random_state, n_jobs=-1
+            ).importances_mean
+        self.feature_importance = dict(zip(self.feature_names, importances))
         
         print("Model training completed!")
         return self
@@ -64,8 +93,7 @@ class DisasterSeverityModel:
         
         # Feature importance
         print("\nTop 5 Most Important Features:")
-        sorted_features = sorted(self.feature_importance.items(), key=lambda x: x[1], reverse=True)
-        for feature, importance in sorted_features[:5]:
+        for feature, importance in self.get_feature_importance()[:5]:
             print(f"{feature}: {importance:.4f}")
         
         return {
@@ -90,6 +118,28 @@ class DisasterSeverityModel:
         
         return self.model.predict_proba(X)
     
+    def predict_batch(self, rows, preprocessor):
+        """Predict severities for a list of input dicts in a single model call."""
+        if not self.is_trained:
+            print("Model is not trained yet!")
+            return None
+        
+        n_rows = len(rows)
+        if n_rows == 0:
+            return np.empty(0, dtype=object)
+        
+        # Reuse a float32 buffer across calls
+        first = preprocessor.preprocess_single_input(rows[0])
+        n_features = first.shape[1]
+        if self._pred_buf is None or self._pred_buf.shape[0] < n_rows or self._pred_buf.shape[1] != n_features:
+            self._pred_buf = np.empty((n_rows, n_features), dtype=np.float32)
+        
+        self._pred_buf[0] = first[0]
+        for i in range(1, n_rows):
+            self._pred_buf[i] = preprocessor.preprocess_single_input(rows[i])[0]
+        
+        return self.model.predict(self._pred_buf[:n_rows])
+    
     def save_model(self, filepath):
         """Save the trained model to disk."""
         if not self.is_trained:
@@ -108,7 +158,8 @@ class DisasterSeverityModel:
                 'is_trained': self.is_trained
             }
             
-            joblib.dump(model_data, filepath)
+            # Compressed on disk; joblib cannot memory-map compressed pickles, so load reads it fully
+            joblib.dump(model_data, filepath, compress=3, protocol=5)
             print(f"Model saved successfully to: {filepath}")
             return True
         except Exception as e:
@@ -124,6 +175,8 @@ class DisasterSeverityModel:
             self.feature_names = model_data['feature_names']
             self.feature_importance = model_data['feature_importance']
             self.is_trained = model_data['is_trained']
+            if hasattr(self.model, 'n_jobs'):
+                self.model.n_jobs = -1  # Older Random Forest models
             
             print(f"Model loaded successfully from: {filepath}")
             return True
@@ -132,19 +185,25 @@ class DisasterSeverityModel:
             return False
     
     def get_feature_importance(self):
-        """Get feature importance as a sorted dictionary."""
+        """Get feature importance as (feature, importance) pairs, most important first."""
         if not self.is_trained:
             return None
         
-        return sorted(self.feature_importance.items(), key=lambda x: x[1], reverse=True)
+        names = list(self.feature_importance)
+        importances = np.fromiter(self.feature_importance.values(), dtype=np.float64, count=len(names))
+        # Stable descending sort keeps ties in feature order, as sorted(..., reverse=True) did
+        order = np.argsort(-importances, kind='stable')
+        values = list(self.feature_importance.values())
+        return [(names[i], values[i]) for i in order]
 
-def train_disaster_model(X_train, X_test, y_train, y_test, save_path='models/model.pkl'):
+def train_disaster_model(X_train, X_test, y_train, y_test, save_path='models/model.pkl', feature_names=None,
+                         model_type='hist_gbdt'):
     """Complete model training pipeline."""
     print("Starting model training pipeline...")
     
     # Initialize and train model
-    model = DisasterSeverityModel()
-    model.train(X_train, y_train)
+    model = DisasterSeverityModel(model_type=model_type)
+    model.train(X_train, y_train, feature_names=feature_names)
     
     # Evaluate model
     evaluation_results = model.evaluate(X_test, y_test)
@@ -3,11 +3,102 @@ Resource allocation algorithm for disaster relief optimization.
 Implements priority-based distribution of relief resources.
 """
 
+import math
+import re
+from bisect import bisect_right
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Optional Numba kernel for the allocation scan; _allocate_matrix falls back to NumPy and Python without it
+try:
+    from numba import config as numba_config, njit
+    
+    # Under NUMBA_DISABLE_JIT=1 the kernel would run as a plain Python loop; take the fallback path instead
+    if numba_config.DISABLE_JIT:
+        raise ImportError("Numba JIT is disabled")
+    
+    @njit(cache=True)
+    def _allocate_kernel(needs, severity_weights, available, total_needs, allocated, remaining):
+        n_disasters, n_resources = needs.shape
+        for r in range(n_resources):
+            left = available[r]
+            for i in range(n_disasters):
+                needed = needs[i, r]
+                if needed <= left:
+                    amount = needed
+                elif total_needs[r] > 0:
+                    amount = min(int(left * (needed / total_needs[r]) * severity_weights[i]), left, needed)
+                else:
+                    amount = 0
+                allocated[i, r] = amount
+                left -= amount
+            remaining[r] = left
+except ImportError:
+    _allocate_kernel = None
+
+
+@lru_cache(maxsize=8)
+def _disaster_key_table(disaster_keys: Tuple[str, ...]):
+    """Prebuilt lookup structures for _match_disaster_key.
+    
+    A lookahead alternation finds every key inside a disaster type in one scan,
+    overlaps included; the NUL-joined keys answer 'type inside a key' with one find.
+    """
+    pattern = re.compile('(?=(' + '|'.join(map(re.escape, disaster_keys)) + '))')
+    key_index = {key: i for i, key in enumerate(disaster_keys)}
+    joined = '\0'.join(disaster_keys)
+    starts = [0]
+    for key in disaster_keys[:-1]:
+        starts.append(starts[-1] + len(key) + 1)
+    return pattern, key_index, joined, starts
+
+@lru_cache(maxsize=128)
+def _match_disaster_key(disaster_keys: Tuple[str, ...], disaster_type_lower: str) -> int:
+    """Index of the first key that partially matches a disaster type, or len(disaster_keys)."""
+    pattern, key_index, joined, starts = _disaster_key_table(disaster_keys)
+    idx = len(disaster_keys)
+    
+    # Keys contained in the disaster type
+    for match in pattern.finditer(disaster_type_lower):
+        idx = min(idx, key_index[match.group(1)])
+    
+    # Disaster type contained in a key (the first occurrence is in the earliest such key)
+    if '\0' not in disaster_type_lower:
+        pos = joined.find(disaster_type_lower)
+        if pos >= 0:
+            idx = min(idx, bisect_right(starts, pos) - 1)
+    
+    return idx
+
+@dataclass
+class AllocationBatch:
+    """Allocation state for a batch of disasters as parallel arrays, one row per disaster in priority order."""
+    order: np.ndarray           # (N,) index of each row in the input disaster list
+    severity_code: np.ndarray   # (N,) index into ResourceAllocator.SEVERITY_LEVELS
+    people: np.ndarray          # (N,) people affected
+    priority_score: np.ndarray  # (N,)
+    needs: np.ndarray           # (N, R) adjusted needs
+    allocated: np.ndarray       # (N, R)
+    unmet: np.ndarray           # (N, R)
+    fulfillment: np.ndarray     # (N,) share of total need allocated
+
 
 class ResourceAllocator:
+    SEVERITY_LEVELS = ('High', 'Medium', 'Low')
+    _SEVERITY_CODES = {level: code for code, level in enumerate(SEVERITY_LEVELS)}
+    # Priority points per severity code (see _calculate_priority_score)
+    _SEVERITY_SCORES = np.array([3, 2, 1])
+    
+    # Base ratios per person, aligned with resource_types (can be adjusted based on domain expertise):
+    # less than 1 food kit per person (family sharing), more water, fewer medicine kits,
+    # multiple people per shelter unit
+    _BASE_PER_PERSON = np.array([0.8, 1.2, 0.3, 0.25])
+    # Need multipliers indexed by severity code (High, Medium, Low)
+    _SEVERITY_MULTIPLIER_BY_CODE = np.array([1.5, 1.2, 1.0])
+    
     def __init__(self):
         """Initialize resource allocator with default settings."""
         self.severity_weights = {
@@ -35,50 +126,70 @@ class ResourceAllocator:
             'landslide': {'Medicine Kits': 1.4, 'Shelter Units': 1.2, 'Food Kits': 1.1},
             'wildfire': {'Medicine Kits': 1.3, 'Water Packs': 1.2, 'Shelter Units': 1.1}
         }
+        
+        # One row of factors per disaster type, plus a trailing row of ones for unmatched types
+        self._disaster_keys = tuple(self.disaster_adjustments)
+        self._dtype_index = {key: i for i, key in enumerate(self._disaster_keys)}
+        self._adj_matrix = np.ones((len(self._disaster_keys) + 1, len(self.resource_types)))
+        for i, factors in enumerate(self.disaster_adjustments.values()):
+            for resource, factor in factors.items():
+                self._adj_matrix[i, self.resource_types.index(resource)] = factor
     
     def calculate_base_need(self, people_affected: int, severity: str) -> Dict[str, int]:
         """Calculate base resource needs based on people affected and severity."""
-        # Base ratios per person (can be adjusted based on domain expertise)
-        base_per_person = {
-            'Food Kits': 0.8,      # Less than 1 kit per person (family sharing)
-            'Water Packs': 1.2,    # More water needed
-            'Medicine Kits': 0.3,  # Less medicine kits needed
-            'Shelter Units': 0.25  # Multiple people per shelter unit
-        }
-        
-        # Severity multipliers
-        severity_multipliers = {
-            'High': 1.5,
-            'Medium': 1.2,
-            'Low': 1.0
-        }
-        
-        multiplier = severity_multipliers.get(severity, 1.0)
+        # Unknown severities get no multiplier
+        code = self._SEVERITY_CODES.get(severity)
+        multiplier = float(self._SEVERITY_MULTIPLIER_BY_CODE[code]) if code is not None else 1.0
         
         base_needs = {}
-        for resource, ratio in base_per_person.items():
+        for resource, ratio in zip(self.resource_types, self._BASE_PER_PERSON.tolist()):
             base_needs[resource] = max(1, int(people_affected * ratio * multiplier))
         
         return base_needs
     
     def adjust_for_disaster_type(self, base_needs: Dict[str, int], disaster_type: str) -> Dict[str, int]:
-        """Adjust resource needs based on disaster type."""
-        disaster_type_lower = disaster_type.lower()
+        """Adjust resource needs based on disaster type.
         
+        base_needs is updated in place and returned; pass a copy to keep the original.
+        """
         # Find matching disaster type (partial match)
-        adjustments = {}
-        for disaster_key, adjustment_factors in self.disaster_adjustments.items():
-            if disaster_key in disaster_type_lower or disaster_type_lower in disaster_key:
-                adjustments = adjustment_factors
-                break
+        idx = self._disaster_type_index(disaster_type)
+        adjustments = self.disaster_adjustments[self._disaster_keys[idx]] if idx < len(self._disaster_keys) else {}
         
         # Apply adjustments
-        adjusted_needs = base_needs.copy()
         for resource, factor in adjustments.items():
-            if resource in adjusted_needs:
-                adjusted_needs[resource] = int(adjusted_needs[resource] * factor)
+            if resource in base_needs:
+                base_needs[resource] = int(base_needs[resource] * factor)
+        
+        return base_needs
+    
+    def _disaster_type_index(self, disaster_type: str) -> int:
+        """Row of _adj_matrix for a disaster type (exact hit, else partial match, first key wins)."""
+        disaster_type_lower = disaster_type.lower()
+        idx = self._dtype_index.get(disaster_type_lower)
+        if idx is None:
+            idx = _match_disaster_key(self._disaster_keys, disaster_type_lower)
+        return idx
+    
+    def _calculate_needs(self, people: np.ndarray, severity_code: np.ndarray,
+                         disaster_types: Sequence[str]) -> np.ndarray:
+        """Adjusted needs for all disasters as an (N, 4) int array, matching
+        calculate_base_need followed by adjust_for_disaster_type row by row."""
+        n = len(people)
+        multipliers = self._SEVERITY_MULTIPLIER_BY_CODE[severity_code]
+        type_idx = np.fromiter(
+            (self._disaster_type_index(disaster_type) for disaster_type in disaster_types), dtype=np.intp, count=n
+        )
         
-        return adjusted_needs
+        # Same operation order and truncation as the scalar path: int(people * ratio * multiplier), at least 1,
+        # then int(need * factor) for the disaster type
+        needs = people[:, None] * self._BASE_PER_PERSON
+        needs *= multipliers[:, None]
+        np.trunc(needs, out=needs)
+        np.maximum(needs, 1, out=needs)
+        needs *= self._adj_matrix[type_idx]
+        np.trunc(needs, out=needs)
+        return needs.astype(np.int64)
     
     def allocate_resources(self, 
                           disasters: List[Dict], 
@@ -94,64 +205,84 @@ class ResourceAllocator:
         Returns:
             Dictionary with allocation results
         """
+        return self.allocate_resources_arrays(
+            [d['severity'] for d in disasters],
+            [d['people_affected'] for d in disasters],
+            [d['disaster_type'] for d in disasters],
+            available_resources,
+            [d.get('location', 'Unknown') for d in disasters]
+        )
+    
+    def allocate_resources_arrays(self,
+                                  severities: Sequence[str],
+                                  people_affected: Sequence[int],
+                                  disaster_types: Sequence[str],
+                                  available_resources: Dict[str, int],
+                                  locations: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Allocate resources across disasters given as parallel columns.
         
-        # Step 1: Calculate needs for each disaster
-        disaster_needs = []
-        total_needs = {resource: 0 for resource in self.resource_types}
+        Same result as allocate_resources, without building a dict per disaster first.
         
-        for i, disaster in enumerate(disasters):
-            # Calculate base needs
-            base_needs = self.calculate_base_need(
-                disaster['people_affected'], 
-                disaster['severity']
-            )
-            
-            # Adjust for disaster type
-            adjusted_needs = self.adjust_for_disaster_type(
-                base_needs, 
-                disaster['disaster_type']
-            )
-            
-            disaster_info = {
-                'index': i,
-                'severity': disaster['severity'],
-                'people_affected': disaster['people_affected'],
-                'disaster_type': disaster['disaster_type'],
-                'location': disaster.get('location', 'Unknown'),
-                'needs': adjusted_needs,
-                'priority_score': self._calculate_priority_score(disaster)
-            }
-            
-            disaster_needs.append(disaster_info)
-            
-            # Add to total needs
-            for resource, amount in adjusted_needs.items():
-                total_needs[resource] += amount
+        Args:
+            severities: Severity label per disaster ('High', 'Medium' or 'Low')
+            people_affected: People affected per disaster (list or array)
+            disaster_types: Disaster type per disaster
+            available_resources: Dictionary of available resources
+            locations: Location per disaster; 'Unknown' when omitted
         
-        # Step 2: Sort disasters by priority (severity and people affected)
-        disaster_needs.sort(key=lambda x: x['priority_score'], reverse=True)
+        Returns:
+            Dictionary with allocation results
+        """
+        if isinstance(people_affected, np.ndarray):
+            people_affected = people_affected.tolist()
+        n = len(people_affected)
+        if locations is None:
+            locations = ['Unknown'] * n
+        people = np.fromiter(people_affected, dtype=np.float64, count=n)
+        
+        # Severity labels become integer codes once; every per-severity value below is an array lookup
+        severity_code = np.fromiter((self._SEVERITY_CODES[severity] for severity in severities), dtype=np.intp, count=n)
+        
+        # Step 1: Calculate needs for all disasters in one vectorised pass
+        needs_matrix = self._calculate_needs(people, severity_code, disaster_types)
+        total_needs = needs_matrix.sum(axis=0)
+        
+        # Step 2: Sort disasters by priority (severity and people affected); a stable sort keeps input order on ties
+        priority_scores = self._SEVERITY_SCORES[severity_code] * 100 + np.log10(np.maximum(1, people))
+        order = np.argsort(-priority_scores, kind='stable')
+        severity_code = severity_code[order]
+        needs_sorted = needs_matrix[order]
+        
+        # Step 3: Allocate resources based on priority and availability, one pass per resource type
+        level_weights = np.array([self.severity_weights[level] for level in self.SEVERITY_LEVELS])  # by code
+        available = [available_resources.get(resource, 0) for resource in self.resource_types]
+        allocated, remaining = self._allocate_matrix(
+            needs_sorted, level_weights[severity_code], available, total_needs
+        )
         
-        # Step 3: Allocate resources based on priority and availability
-        allocations = []
         remaining_resources = available_resources.copy()
-        
-        for disaster_info in disaster_needs:
-            allocation = self._allocate_to_single_disaster(
-                disaster_info, 
-                remaining_resources,
-                total_needs
-            )
-            
-            allocations.append(allocation)
-            
-            # Update remaining resources
-            for resource, amount in allocation['allocated'].items():
-                remaining_resources[resource] -= amount
+        remaining_resources.update(zip(self.resource_types, remaining))
+        
+        # Fulfillment per disaster; a disaster with no need counts as fully served
+        need_totals = needs_sorted.sum(axis=1)
+        fulfillment = np.divide(allocated.sum(axis=1), need_totals, out=np.ones(len(order)), where=need_totals > 0)
+        
+        batch = AllocationBatch(
+            order=order,
+            severity_code=severity_code,
+            people=people[order],
+            priority_score=priority_scores[order],
+            needs=needs_sorted,
+            allocated=allocated,
+            unmet=needs_sorted - allocated,
+            fulfillment=fulfillment
+        )
         
         # Step 4: Prepare summary
         summary = self._prepare_allocation_summary(
-            disasters, 
-            allocations, 
+            (severities, people_affected, disaster_types, locations), 
+            batch, 
             available_resources, 
             remaining_resources,
             total_needs
@@ -160,121 +291,128 @@ class ResourceAllocator:
         return summary
     
     def _calculate_priority_score(self, disaster: Dict) -> float:
-        """Calculate priority score for disaster ranking."""
+        """Calculate priority score for disaster ranking (scalar form of the score used in allocate_resources)."""
         severity_scores = {'High': 3, 'Medium': 2, 'Low': 1}
         
         severity_score = severity_scores.get(disaster['severity'], 1)
         people_affected = disaster['people_affected']
         
         # Normalize people affected (log scale to prevent extreme values)
-        normalized_people = np.log10(max(1, people_affected))
+        normalized_people = math.log10(max(1, people_affected))
         
         # Combined score
         priority_score = severity_score * 100 + normalized_people
         
         return priority_score
     
-    def _allocate_to_single_disaster(self, 
-                                   disaster_info: Dict, 
-                                   available_resources: Dict[str, int],
-                                   total_needs: Dict[str, int]) -> Dict:
-        """Allocate resources to a single disaster."""
-        allocated = {}
-        unmet_needs = {}
-        
-        severity = disaster_info['severity']
-        needs = disaster_info['needs']
-        
-        for resource in self.resource_types:
-            needed = needs.get(resource, 0)
-            available = available_resources.get(resource, 0)
+    @staticmethod
+    def _allocate_matrix(needs: np.ndarray,
+                         severity_weights: np.ndarray,
+                         available: List[int],
+                         total_needs: np.ndarray) -> Tuple[np.ndarray, List[int]]:
+        """
+        Allocate each resource column down the priority-sorted needs matrix.
+        
+        A disaster gets its full need while it fits in what is left; otherwise it
+        gets int(remaining * need / total_need * severity_weight), capped by both.
+        Returns the (N, R) allocation matrix and what remains of each resource.
+        """
+        n_disasters, n_resources = needs.shape
+        allocated = np.empty_like(needs)
+        
+        if _allocate_kernel is not None:
+            remaining = np.empty(n_resources, dtype=np.int64)
+            _allocate_kernel(needs, severity_weights,
+                             np.asarray(available, dtype=np.int64), total_needs,
+                             allocated, remaining)
+            return allocated, remaining.tolist()
+        
+        severity_weights = severity_weights.tolist()
+        total_needs = total_needs.tolist()
+        remaining_out = []
+        
+        for r in range(n_resources):
+            column = needs[:, r]
+            avail = available[r]
             
-            if needed <= available:
-                # Can fulfill complete need
-                allocated[resource] = needed
-                unmet_needs[resource] = 0
-            else:
-                # Partial allocation based on severity priority
-                severity_weight = self.severity_weights[severity]
-                
-                # Calculate fair share based on proportion of total need
-                if total_needs[resource] > 0:
-                    proportion = needed / total_needs[resource]
-                    fair_allocation = int(available * proportion * severity_weight)
-                    allocated[resource] = min(fair_allocation, available, needed)
+            # Leading disasters whose cumulative need fits are fully served in one step
+            k = int(np.count_nonzero(np.cumsum(column) <= avail))
+            allocated[:k, r] = column[:k]
+            remaining = avail - int(column[:k].sum())
+            
+            # The rest depends on what earlier disasters took, so scan it in order
+            total = total_needs[r]
+            for i, needed in enumerate(column[k:].tolist(), start=k):
+                if needed <= remaining:
+                    amount = needed
+                elif total > 0:
+                    amount = min(int(remaining * (needed / total) * severity_weights[i]), remaining, needed)
                 else:
-                    allocated[resource] = 0
-                
-                unmet_needs[resource] = needed - allocated[resource]
-        
-        return {
-            'disaster_index': disaster_info['index'],
-            'severity': severity,
-            'people_affected': disaster_info['people_affected'],
-            'disaster_type': disaster_info['disaster_type'],
-            'location': disaster_info['location'],
-            'needed': needs,
-            'allocated': allocated,
-            'unmet_needs': unmet_needs,
-            'fulfillment_rate': self._calculate_fulfillment_rate(needs, allocated)
-        }
-    
-    def _calculate_fulfillment_rate(self, needs: Dict, allocated: Dict) -> float:
-        """Calculate overall fulfillment rate for a disaster."""
-        total_need = sum(needs.values())
-        total_allocated = sum(allocated.values())
-        
-        if total_need == 0:
-            return 1.0
+                    amount = 0
+                allocated[i, r] = amount
+                remaining -= amount
+            
+            remaining_out.append(remaining)
         
-        return total_allocated / total_need
+        return allocated, remaining_out
     
     def _prepare_allocation_summary(self, 
-                                  disasters: List[Dict],
-                                  allocations: List[Dict],
+                                  columns: Tuple[Sequence, Sequence, Sequence, Sequence],
+                                  batch: AllocationBatch,
                                   available_resources: Dict[str, int],
                                   remaining_resources: Dict[str, int],
-                                  total_needs: Dict[str, int]) -> Dict:
-        """Prepare comprehensive allocation summary."""
+                                  total_needs: np.ndarray) -> Dict:
+        """Prepare comprehensive allocation summary.
+        
+        columns holds the input (severities, people_affected, disaster_types, locations).
+        """
+        severities, people_affected, disaster_types, locations = columns
         
         # Calculate total allocated by resource type
-        total_allocated = {resource: 0 for resource in self.resource_types}
-        for allocation in allocations:
-            for resource, amount in allocation['allocated'].items():
-                total_allocated[resource] += amount
+        allocated_totals = batch.allocated.sum(axis=0)
+        total_allocated = dict(zip(self.resource_types, allocated_totals.tolist()))
         
         # Calculate utilization rates
-        utilization_rates = {}
-        for resource in self.resource_types:
-            available = available_resources.get(resource, 0)
-            if available > 0:
-                utilization_rates[resource] = (total_allocated[resource] / available) * 100
-            else:
-                utilization_rates[resource] = 0
+        available = np.array([available_resources.get(resource, 0) for resource in self.resource_types])
+        rates = np.divide(allocated_totals, available, out=np.zeros(len(available)), where=available > 0) * 100
+        utilization_rates = {
+            resource: rate if avail > 0 else 0
+            for resource, rate, avail in zip(self.resource_types, rates.tolist(), available.tolist())
+        }
         
         # Calculate overall fulfillment by severity
-        severity_stats = {'High': [], 'Medium': [], 'Low': []}
-        for allocation in allocations:
-            severity = allocation['severity']
-            severity_stats[severity].append(allocation['fulfillment_rate'])
-        
         avg_fulfillment_by_severity = {}
-        for severity, rates in severity_stats.items():
-            if rates:
-                avg_fulfillment_by_severity[severity] = np.mean(rates) * 100
-            else:
-                avg_fulfillment_by_severity[severity] = 0
+        for code, severity in enumerate(self.SEVERITY_LEVELS):
+            mask = batch.severity_code == code
+            avg_fulfillment_by_severity[severity] = batch.fulfillment[mask].mean() * 100 if mask.any() else 0
+        
+        # Convert the batch to per-disaster dicts in one pass
+        allocations = []
+        rows = zip(batch.order.tolist(), batch.needs.tolist(), batch.allocated.tolist(), batch.unmet.tolist(),
+                   batch.fulfillment.tolist())
+        for i, needs_row, allocated_row, unmet_row, rate in rows:
+            allocations.append({
+                'disaster_index': i,
+                'severity': severities[i],
+                'people_affected': people_affected[i],
+                'disaster_type': disaster_types[i],
+                'location': locations[i],
+                'needed': dict(zip(self.resource_types, needs_row)),
+                'allocated': dict(zip(self.resource_types, allocated_row)),
+                'unmet_needs': dict(zip(self.resource_types, unmet_row)),
+                'fulfillment_rate': rate
+            })
         
         return {
             'allocations': allocations,
             'summary_stats': {
-                'total_disasters': len(disasters),
-                'total_people_affected': sum(d['people_affected'] for d in disasters),
+                'total_disasters': len(people_affected),
+                'total_people_affected': sum(people_affected),
                 'resource_utilization': utilization_rates,
                 'avg_fulfillment_by_severity': avg_fulfillment_by_severity,
                 'total_allocated': total_allocated,
                 'remaining_resources': remaining_resources,
-                'total_needs': total_needs
+                'total_needs': dict(zip(self.resource_types, total_needs.tolist()))
             }
         }
     
@@ -0,0 +1,117 @@
+-- SQL Schema for Disaster Relief Resource Optimizer
+-- Paste this into your Supabase SQL Editor
+
+-- Enable RLS (Row Level Security)
+ALTER TABLE IF EXISTS users ENABLE ROW LEVEL SECURITY;
+
+-- Create users table for additional user data
+CREATE TABLE IF NOT EXISTS users (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    email TEXT UNIQUE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    role TEXT DEFAULT 'user' CHECK (role IN ('user', 'admin')),
+    full_name TEXT,
+    organization TEXT,
+    last_login TIMESTAMP WITH TIME ZONE
+);
+
+-- Create predictions table to store ML predictions
+CREATE TABLE IF NOT EXISTS predictions (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    disaster_type TEXT NOT NULL,
+    state TEXT,
+    district TEXT,
+    people_affected INTEGER,
+    deaths INTEGER,
+    damages BIGINT,
+    predicted_severity TEXT CHECK (predicted_severity IN ('Low', 'Medium', 'High')),
+    prediction_confidence JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Create resource_allocations table to store allocation results
+CREATE TABLE IF NOT EXISTS resource_allocations (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    prediction_id UUID REFERENCES predictions(id) ON DELETE CASCADE,
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    food_kits_allocated INTEGER DEFAULT 0,
+    water_packs_allocated INTEGER DEFAULT 0,
+    medicine_kits_allocated INTEGER DEFAULT 0,
+    shelter_units_allocated INTEGER DEFAULT 0,
+    fulfillment_rate DECIMAL(5,2),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Create indexes for better performance
+-- Covering index so the login profile lookup is an index-only scan (supersedes the plain email index)
+DROP INDEX IF EXISTS idx_users_email;
+CREATE INDEX IF NOT EXISTS idx_users_email_covering ON users(email) INCLUDE (id, role, full_name, organization);
+CREATE INDEX IF NOT EXISTS idx_predictions_user_id ON predictions(user_id);
+CREATE INDEX IF NOT EXISTS idx_predictions_created_at ON predictions(created_at);
+CREATE INDEX IF NOT EXISTS idx_resource_allocations_user_id ON resource_allocations(user_id);
+
+-- RLS Policies
+-- Users can only see their own data
+CREATE POLICY "Users can view own data" ON users
+    FOR SELECT USING (auth.uid() = id);
+
+CREATE POLICY "Users can update own data" ON users
+    FOR UPDATE USING (auth.uid() = id);
+
+-- Predictions policies
+CREATE POLICY "Users can view own predictions" ON predictions
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can insert own predictions" ON predictions
+    FOR INSERT WITH CHECK (auth.uid() = user_id);
+
+-- Resource allocations policies
+CREATE POLICY "Users can view own allocations" ON resource_allocations
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can insert own allocations" ON resource_allocations
+    FOR INSERT WITH CHECK (auth.uid() = user_id);
+
+-- Function to automatically set updated_at timestamp
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- Function to fetch a user's profile row in a single round-trip at login
+CREATE OR REPLACE FUNCTION login_with_profile(p_email TEXT)
+RETURNS JSON AS $$
+    SELECT json_build_object('id', u.id, 'role', u.role, 'full_name', u.full_name, 'organization', u.organization)
+    FROM users u WHERE u.email = p_email LIMIT 1;
+$$ LANGUAGE sql STABLE;
+
+-- Trigger to automatically update updated_at
+CREATE TRIGGER update_users_updated_at 
+    BEFORE UPDATE ON users 
+    FOR EACH ROW 
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Create the public users row server-side whenever someone signs up
+CREATE OR REPLACE FUNCTION public.handle_new_user()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO public.users (id, email, role)
+    VALUES (NEW.id, NEW.email, 'user');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER on_auth_user_created
+    AFTER INSERT ON auth.users
+    FOR EACH ROW
+    EXECUTE FUNCTION public.handle_new_user();
+
+-- Insert default admin user (optional)
+-- INSERT INTO users (email, role, full_name) 
+-- VALUES ('admin@disaster.com', 'admin', 'System Administrator')
+-- ON CONFLICT (email) DO NOTHING;
@@ -7,20 +7,64 @@ import streamlit as st
 from datetime import datetime, timedelta
 import json
 import os
+import threading
+import atexit
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, Optional, List
-import sys
 
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+# Activities kept per user
+MAX_ACTIVITIES = 100
+
+# Permissions granted to each role
+_PERMISSIONS = {
+    "admin": (
+        "view_dashboard", "make_predictions", "bulk_processing", 
+        "view_analytics", "manage_users", "export_data", 
+        "system_settings", "view_all_activities"
+    ),
+    "manager": (
+        "view_dashboard", "make_predictions", "bulk_processing", 
+        "view_analytics", "export_data", "view_team_activities"
+    ),
+    "user": (
+        "view_dashboard", "make_predictions", "view_analytics"
+    )
+}
+
+# Display labels for permissions, built once at import
+_PRETTY_PERMS = {perm: perm.replace('_', ' ').title() for perms in _PERMISSIONS.values() for perm in perms}
+
+@lru_cache(maxsize=256)
+def _pretty_label(key: str) -> str:
+    """Display label for a snake_case key, e.g. activity detail names."""
+    return _PRETTY_PERMS.get(key) or key.replace('_', ' ').title()
+
+# auth is a sibling module; callers already put src/ on sys.path
 from auth import get_supabase_client, get_auth_instance
 
 class UserProfileManager:
     """Manages user profiles, roles, and preferences."""
     
+    # Delay before pending changes are written out, so bursts of updates share one write
+    FLUSH_DELAY = 0.5
+    
+    # The manager is shared by all sessions, so auth is looked up per session on access
+    @property
+    def supabase(self):
+        return get_supabase_client()
+    
+    @property
+    def auth_instance(self):
+        return get_auth_instance()
+    
     def __init__(self):
-        self.supabase = get_supabase_client()
-        self.auth_instance = get_auth_instance()
         self.profiles_file = "data/user_profiles.json"
         self.activity_file = "data/user_activity.json"
         
@@ -29,96 +73,129 @@ class UserProfileManager:
         
         # Initialize files if they don't exist
         self._initialize_files()
+        
+        # Parse both files once and serve reads from memory; writes are coalesced by flush()
+        self._lock = threading.RLock()
+        self._profiles = self._read_json(self.profiles_file)
+        self._activity = {
+            user_id: deque(activities, maxlen=MAX_ACTIVITIES)
+            for user_id, activities in self._read_json(self.activity_file).items()
+        }
+        self._dirty = set()
+        self._flush_timer = None
+        atexit.register(self.flush)
     
     def _initialize_files(self):
         """Initialize JSON files if they don't exist."""
-        if not os.path.exists(self.profiles_file):
-            with open(self.profiles_file, 'w') as f:
-                json.dump({}, f)
-        
-        if not os.path.exists(self.activity_file):
-            with open(self.activity_file, 'w') as f:
-                json.dump({}, f)
+        for path in (self.profiles_file, self.activity_file):
+            if not os.path.exists(path):
+                self._write_json(path, {})
     
-    def _load_profiles(self) -> Dict:
-        """Load user profiles from JSON file."""
+    @staticmethod
+    def _read_json(path: str) -> Dict:
+        """Read a JSON file, returning an empty dict if it is missing or invalid."""
         try:
-            with open(self.profiles_file, 'r') as f:
+            with open(path, 'r') as f:
                 return json.load(f)
         except:
             return {}
     
+    def _load_profiles(self) -> Dict:
+        """Return the in-memory user profiles."""
+        return self._profiles
+    
     def _save_profiles(self, profiles: Dict):
-        """Save user profiles to JSON file."""
-        try:
-            with open(self.profiles_file, 'w') as f:
-                json.dump(profiles, f, indent=2, default=str)
-        except Exception as e:
-            st.error(f"Error saving profiles: {e}")
+        """Mark user profiles as changed; they are written by the next flush."""
+        with self._lock:
+            self._profiles = profiles
+            self._dirty.add(self.profiles_file)
+            self._schedule_flush()
     
     def _load_activity(self) -> Dict:
-        """Load user activity from JSON file."""
-        try:
-            with open(self.activity_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
+        """Return the in-memory user activity."""
+        return self._activity
     
     def _save_activity(self, activity: Dict):
-        """Save user activity to JSON file."""
-        try:
-            with open(self.activity_file, 'w') as f:
-                json.dump(activity, f, indent=2, default=str)
-        except Exception as e:
-            st.error(f"Error saving activity: {e}")
+        """Mark user activity as changed; it is written by the next flush."""
+        with self._lock:
+            self._activity = activity
+            self._dirty.add(self.activity_file)
+            self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """Start a flush timer unless one is already pending."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def flush(self):
+        """Write any changed files to disk."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending = {
+                self.profiles_file: lambda: self._profiles,
+                self.activity_file: lambda: {k: list(v) for k, v in self._activity.items()},
+            }
+            for path in list(self._dirty):
+                try:
+                    self._write_json(path, pending[path]())
+                    self._dirty.discard(path)
+                except Exception as e:
+                    # May run on the timer thread, outside any Streamlit script context
+                    print(f"Error saving {path}: {e}")
+    
+    @staticmethod
+    def _write_json(path: str, data: Dict):
+        """Serialize data to a temp file and atomically replace path with it."""
+        if orjson is not None:
+            # NON_STR_KEYS matches json's handling of int keys, e.g. in allocation details
+            payload = orjson.dumps(data, default=str,
+                                   option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(data, separators=(',', ':'), default=str).encode()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
     
     def create_profile(self, user_id: str, email: str, role: str = "user") -> Dict:
         """Create a new user profile."""
-        profiles = self._load_profiles()
-        
-        profile = {
-            "user_id": user_id,
-            "email": email,
-            "role": role,  # "admin", "manager", "user"
-            "created_at": datetime.now().isoformat(),
-            "last_login": datetime.now().isoformat(),
-            "preferences": {
-                "theme": "light",
-                "dashboard_layout": "default",
-                "notifications": True,
-                "auto_refresh": True,
-                "default_view": "dashboard"
-            },
-            "permissions": self._get_role_permissions(role),
-            "stats": {
-                "predictions_made": 0,
-                "disasters_processed": 0,
-                "resources_allocated": 0,
-                "login_count": 1
+        with self._lock:
+            profiles = self._load_profiles()
+            now = datetime.now().isoformat()
+            
+            profile = {
+                "user_id": user_id,
+                "email": email,
+                "role": role,  # "admin", "manager", "user"
+                "created_at": now,
+                "last_login": now,
+                "preferences": {
+                    "theme": "light",
+                    "dashboard_layout": "default",
+                    "notifications": True,
+                    "auto_refresh": True,
+                    "default_view": "dashboard"
+                },
+                "permissions": self._get_role_permissions(role),
+                "stats": {
+                    "predictions_made": 0,
+                    "disasters_processed": 0,
+                    "resources_allocated": 0,
+                    "login_count": 1
+                }
             }
-        }
-        
-        profiles[user_id] = profile
-        self._save_profiles(profiles)
-        return profile
+            
+            profiles[user_id] = profile
+            self._save_profiles(profiles)
+            return profile
     
     def _get_role_permissions(self, role: str) -> List[str]:
         """Get permissions based on user role."""
-        permissions = {
-            "admin": [
-                "view_dashboard", "make_predictions", "bulk_processing", 
-                "view_analytics", "manage_users", "export_data", 
-                "system_settings", "view_all_activities"
-            ],
-            "manager": [
-                "view_dashboard", "make_predictions", "bulk_processing", 
-                "view_analytics", "export_data", "view_team_activities"
-            ],
-            "user": [
-                "view_dashboard", "make_predictions", "view_analytics"
-            ]
-        }
-        return permissions.get(role, permissions["user"])
+        return list(_PERMISSIONS.get(role, _PERMISSIONS["user"]))
     
     def get_profile(self, user_id: str) -> Optional[Dict]:
         """Get user profile by user ID."""
@@ -127,56 +204,67 @@ class UserProfileManager:
     
     def update_profile(self, user_id: str, updates: Dict):
         """Update user profile."""
-        profiles = self._load_profiles()
-        if user_id in profiles:
-            profiles[user_id].update(updates)
-            profiles[user_id]["updated_at"] = datetime.now().isoformat()
-            self._save_profiles(profiles)
+        with self._lock:
+            profiles = self._load_profiles()
+            if user_id in profiles:
+                profiles[user_id].update(updates)
+                profiles[user_id]["updated_at"] = datetime.now().isoformat()
+                self._save_profiles(profiles)
     
     def update_last_login(self, user_id: str):
         """Update user's last login time."""
-        profiles = self._load_profiles()
-        if user_id in profiles:
-            profiles[user_id]["last_login"] = datetime.now().isoformat()
-            profiles[user_id]["stats"]["login_count"] += 1
-            self._save_profiles(profiles)
+        with self._lock:
+            profiles = self._load_profiles()
+            if user_id in profiles:
+                profiles[user_id]["last_login"] = datetime.now().isoformat()
+                profiles[user_id]["stats"]["login_count"] += 1
+                self._save_profiles(profiles)
     
     def log_activity(self, user_id: str, activity_type: str, details: Dict = None):
         """Log user activity."""
-        activity_data = self._load_activity()
-        
-        if user_id not in activity_data:
-            activity_data[user_id] = []
-        
-        activity = {
-            "timestamp": datetime.now().isoformat(),
-            "type": activity_type,
-            "details": details or {}
-        }
-        
-        activity_data[user_id].append(activity)
-        
-        # Keep only last 100 activities per user
-        if len(activity_data[user_id]) > 100:
-            activity_data[user_id] = activity_data[user_id][-100:]
-        
-        self._save_activity(activity_data)
+        with self._lock:
+            activity_data = self._load_activity()
+            
+            activity = {
+                "timestamp": datetime.now().isoformat(),
+                "type": activity_type,
+                "details": details or {}
+            }
+            
+            # Bounded deque keeps only the last MAX_ACTIVITIES per user
+            activity_data.setdefault(user_id, deque(maxlen=MAX_ACTIVITIES)).append(activity)
+            
+            self._save_activity(activity_data)
     
     def get_user_activity(self, user_id: str, limit: int = 50) -> List[Dict]:
         """Get user activity history."""
         activity_data = self._load_activity()
-        activities = activity_data.get(user_id, [])
-        return activities[-limit:] if activities else []
+        activities = activity_data.get(user_id)
+        if not activities:
+            return []
+        if limit > 0:
+            # Only walk the tail of the deque
+            return list(islice(activities, max(0, len(activities) - limit), None))
+        # Same as list slicing: limit 0 returns everything, negative limits skip the oldest entries
+        return list(activities)[-limit:]
     
     def increment_stat(self, user_id: str, stat_name: str, amount: int = 1):
         """Increment a user statistic."""
-        profiles = self._load_profiles()
-        if user_id in profiles:
-            if stat_name in profiles[user_id]["stats"]:
-                profiles[user_id]["stats"][stat_name] += amount
-            else:
-                profiles[user_id]["stats"][stat_name] = amount
-            self._save_profiles(profiles)
+        with self._lock:
+            profiles = self._load_profiles()
+            if user_id in profiles:
+                if stat_name in profiles[user_id]["stats"]:
+                    profiles[user_id]["stats"][stat_name] += amount
+                else:
+                    profiles[user_id]["stats"][stat_name] = amount
+                self._save_profiles(profiles)
+    
+    def log_and_increment(self, user_id: str, activity_type: str, details: Optional[Dict],
+                          stat_name: str, amount: int = 1):
+        """Log an activity and bump its statistic together, so both land in the same flush."""
+        with self._lock:
+            self.log_activity(user_id, activity_type, details)
+            self.increment_stat(user_id, stat_name, amount)
     
     def get_all_users(self) -> Dict:
         """Get all user profiles (admin only)."""
@@ -189,6 +277,11 @@ class UserProfileManager:
             return False
         return permission in profile.get("permissions", [])
 
+@st.cache_resource
+def get_profile_manager() -> UserProfileManager:
+    """Shared profile manager, so every caller sees the same in-memory state."""
+    return UserProfileManager()
+
 def create_profile_interface():
     """Create user profile management interface."""
     st.subheader("👤 User Profile Management")
@@ -202,8 +295,8 @@ def create_profile_interface():
     user_id = user_info.get('id', 'unknown')
     email = user_info.get('email', 'unknown@example.com')
     
-    # Initialize profile manager
-    profile_manager = UserProfileManager()
+    # Shared profile manager
+    profile_manager = get_profile_manager()
     
     # Get or create profile
     profile = profile_manager.get_profile(user_id)
@@ -249,11 +342,11 @@ def create_profile_interface():
         col1, col2 = st.columns(2)
         with col1:
             for i, perm in enumerate(permissions[:len(permissions)//2]):
-                st.success(f"✅ {perm.replace('_', ' ').title()}")
+                st.success(f"✅ {_pretty_label(perm)}")
         
         with col2:
             for perm in permissions[len(permissions)//2:]:
-                st.success(f"✅ {perm.replace('_', ' ').title()}")
+                st.success(f"✅ {_pretty_label(perm)}")
     
     with tab2:
         st.markdown("### ⚙️ User Preferences")
@@ -319,7 +412,7 @@ def create_profile_interface():
                 with st.expander(f"🕒 {timestamp} - {activity_type.title()}"):
                     if details:
                         for key, value in details.items():
-                            st.write(f"**{key.replace('_', ' ').title()}:** {value}")
+                            st.write(f"**{_pretty_label(key)}:** {value}")
                     else:
                         st.write("No additional details")
         else:
@@ -333,19 +426,19 @@ def create_profile_interface():
             
             st.markdown("#### 👥 All Users")
             
-            user_data = []
-            for uid, user_profile in all_users.items():
-                user_data.append({
-                    "Email": user_profile.get('email', 'Unknown'),
-                    "Role": user_profile.get('role', 'user').title(),
-                    "Last Login": user_profile.get('last_login', 'Unknown')[:10],
-                    "Predictions": user_profile.get('stats', {}).get('predictions_made', 0),
-                    "Login Count": user_profile.get('stats', {}).get('login_count', 0)
-                })
-            
-            if user_data:
+            if all_users:
                 import pandas as pd
-                df = pd.DataFrame(user_data)
+                users = pd.DataFrame.from_dict(all_users, orient='index')
+                users = users.reindex(index=list(all_users), columns=['email', 'role', 'last_login', 'stats'])
+                stats = pd.json_normalize(users['stats'].map(lambda v: v if isinstance(v, dict) else {}).tolist())
+                stats = stats.reindex(columns=['predictions_made', 'login_count']).fillna(0).astype(int)
+                df = pd.DataFrame({
+                    "Email": users['email'].fillna('Unknown').to_numpy(),
+                    "Role": users['role'].fillna('user').str.title().to_numpy(),
+                    "Last Login": users['last_login'].fillna('Unknown').str.slice(0, 10).to_numpy(),
+                    "Predictions": stats['predictions_made'].to_numpy(),
+                    "Login Count": stats['login_count'].to_numpy()
+                })
                 st.dataframe(df, use_container_width=True)
             
             # User management actions
@@ -378,36 +471,37 @@ def create_profile_interface():
 # Helper functions for integration with main app
 def log_prediction_activity(user_id: str, prediction_result: str, disaster_type: str):
     """Log a prediction activity."""
-    profile_manager = UserProfileManager()
-    profile_manager.log_activity(
+    profile_manager = get_profile_manager()
+    profile_manager.log_and_increment(
         user_id,
         "prediction_made",
         {
             "result": prediction_result,
             "disaster_type": disaster_type
-        }
+        },
+        "predictions_made"
     )
-    profile_manager.increment_stat(user_id, "predictions_made")
 
 def log_resource_allocation(user_id: str, allocation_details: Dict):
     """Log a resource allocation activity."""
-    profile_manager = UserProfileManager()
-    profile_manager.log_activity(
+    profile_manager = get_profile_manager()
+    profile_manager.log_and_increment(
         user_id,
         "resource_allocation",
-        allocation_details
+        allocation_details,
+        "resources_allocated"
     )
-    profile_manager.increment_stat(user_id, "resources_allocated")
 
 def log_bulk_processing(user_id: str, disaster_count: int):
     """Log bulk processing activity."""
-    profile_manager = UserProfileManager()
-    profile_manager.log_activity(
+    profile_manager = get_profile_manager()
+    profile_manager.log_and_increment(
         user_id,
         "bulk_processing",
-        {"disasters_processed": disaster_count}
+        {"disasters_processed": disaster_count},
+        "disasters_processed",
+        disaster_count
     )
-    profile_manager.increment_stat(user_id, "disasters_processed", disaster_count)
 
 def check_user_permission(permission: str) -> bool:
     """Check if current user has specific permission."""
@@ -415,7 +509,7 @@ def check_user_permission(permission: str) -> bool:
         return False
     
     user_id = st.session_state.user.get('id')
-    profile_manager = UserProfileManager()
+    profile_manager = get_profile_manager()
     return profile_manager.has_permission(user_id, permission)
 
 if __name__ == "__main__":
@@ -2,17 +2,32 @@
 Test script to demonstrate the resource allocation algorithm.
 """
 
+import io
+import random
 import sys
 import os
 sys.path.append('src')
 
 from resource_allocator import ResourceAllocator
 
+def allocate_from_columns(allocator, disasters, available_resources):
+    """Run allocate_resources_arrays on the columns of a list of disaster dicts."""
+    return allocator.allocate_resources_arrays(
+        [d['severity'] for d in disasters],
+        [d['people_affected'] for d in disasters],
+        [d['disaster_type'] for d in disasters],
+        available_resources,
+        [d.get('location', 'Unknown') for d in disasters]
+    )
+
 def test_resource_allocation():
     """Test the resource allocation algorithm with sample disasters."""
     
-    print('🚨 RESOURCE ALLOCATION ALGORITHM TEST')
-    print('=' * 50)
+    # Collect the report in memory and write it to stdout once at the end
+    out = io.StringIO()
+    
+    print('🚨 RESOURCE ALLOCATION ALGORITHM TEST', file=out)
+    print('=' * 50, file=out)
     
     # Initialize allocator
     allocator = ResourceAllocator()
@@ -47,46 +62,79 @@ def test_resource_allocation():
         'Shelter Units': 3000
     }
     
-    print('AVAILABLE RESOURCES:')
+    print('AVAILABLE RESOURCES:', file=out)
     for resource, amount in available_resources.items():
-        print(f'  {resource}: {amount:,}')
-    print()
+        print(f'  {resource}: {amount:,}', file=out)
+    print(file=out)
     
     # Allocate resources
     result = allocator.allocate_resources(test_disasters, available_resources)
     
-    print('ALLOCATION RESULTS BY DISASTER:')
-    print('-' * 40)
+    # The column-oriented entry point must give the same result
+    assert result == allocate_from_columns(allocator, test_disasters, available_resources)
+    
+    # Allocations never exceed what was available
+    for resource, amount in available_resources.items():
+        assert sum(a['allocated'][resource] for a in result['allocations']) <= amount
+    
+    print('ALLOCATION RESULTS BY DISASTER:', file=out)
+    print('-' * 40, file=out)
     for i, allocation in enumerate(result['allocations']):
         severity = allocation['severity']
         location = allocation['location']
         people = allocation['people_affected']
         
-        print(f'Disaster {i+1}: {severity} Severity - {location}')
-        print(f'  People Affected: {people:,}')
-        print(f'  Allocated Resources:')
-        print(f'    Food Kits: {allocation["allocated"]["Food Kits"]:,}')
-        print(f'    Water Packs: {allocation["allocated"]["Water Packs"]:,}') 
-        print(f'    Medicine Kits: {allocation["allocated"]["Medicine Kits"]:,}')
-        print(f'    Shelter Units: {allocation["allocated"]["Shelter Units"]:,}')
-        print(f'  Fulfillment Rate: {allocation["fulfillment_rate"]*100:.1f}%')
-        print()
+        print(f'Disaster {i+1}: {severity} Severity - {location}', file=out)
+        print(f'  People Affected: {people:,}', file=out)
+        print(f'  Allocated Resources:', file=out)
+        print(f'    Food Kits: {allocation["allocated"]["Food Kits"]:,}', file=out)
+        print(f'    Water Packs: {allocation["allocated"]["Water Packs"]:,}', file=out) 
+        print(f'    Medicine Kits: {allocation["allocated"]["Medicine Kits"]:,}', file=out)
+        print(f'    Shelter Units: {allocation["allocated"]["Shelter Units"]:,}', file=out)
+        print(f'  Fulfillment Rate: {allocation["fulfillment_rate"]*100:.1f}%', file=out)
+        print(file=out)
     
-    print('SUMMARY STATISTICS:')
-    print('-' * 30)
+    print('SUMMARY STATISTICS:', file=out)
+    print('-' * 30, file=out)
     stats = result['summary_stats']
-    print(f'Total Disasters: {stats["total_disasters"]}')
-    print(f'Total People Affected: {stats["total_people_affected"]:,}')
-    print()
+    print(f'Total Disasters: {stats["total_disasters"]}', file=out)
+    print(f'Total People Affected: {stats["total_people_affected"]:,}', file=out)
+    print(file=out)
     
-    print('Resource Utilization Rates:')
+    print('Resource Utilization Rates:', file=out)
     for resource, rate in stats['resource_utilization'].items():
-        print(f'  {resource}: {rate:.1f}%')
+        print(f'  {resource}: {rate:.1f}%', file=out)
     
-    print()
-    print('Average Fulfillment by Severity:')
+    print(file=out)
+    print('Average Fulfillment by Severity:', file=out)
     for severity, rate in stats['avg_fulfillment_by_severity'].items():
-        print(f'  {severity}: {rate:.1f}%')
+        print(f'  {severity}: {rate:.1f}%', file=out)
+    
+    sys.stdout.write(out.getvalue())
+
+def test_dict_and_array_paths_match():
+    """allocate_resources and allocate_resources_arrays agree on random scenarios."""
+    rng = random.Random(1)
+    disaster_types = ['flood', 'Flash Flood', 'earthquake', 'Cyclone', 'drought', 'landslide', 'wildfire', 'tsunami', '', 'storm']
+    resources = ['Food Kits', 'Water Packs', 'Medicine Kits', 'Shelter Units']
+    allocator = ResourceAllocator()
+    
+    for _ in range(500):
+        disasters = [
+            {
+                'severity': rng.choice(['High', 'Medium', 'Low']),
+                'people_affected': rng.choice([0, 1, rng.randint(0, 200000)]),
+                'disaster_type': rng.choice(disaster_types),
+                'location': f'Location {i}'
+            }
+            for i in range(rng.randint(0, 12))
+        ]
+        available_resources = {r: rng.choice([0, rng.randint(0, 500), rng.randint(0, 50000)]) for r in resources}
+        
+        by_dict = allocator.allocate_resources([dict(d) for d in disasters], dict(available_resources))
+        by_array = allocate_from_columns(allocator, disasters, dict(available_resources))
+        assert by_dict == by_array, (disasters, available_resources)
 
 if __name__ == "__main__":
-    test_resource_allocation()
\ No newline at end of file
+    test_resource_allocation()
+    test_dict_and_array_paths_match()
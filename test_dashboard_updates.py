@@ -11,11 +11,15 @@ def test_data_loading():
     # Test CSV loading
     data_path = os.path.join('data', 'disaster_data.csv')
     if os.path.exists(data_path):
-        df = pd.read_csv(data_path)
+        # Only the location columns are checked here
+        df = pd.read_csv(data_path, usecols=['state', 'city'], dtype={'state': 'category', 'city': 'category'})
         print(f"✅ Dataset loaded successfully: {len(df)} rows")
         
-        # Test countries
-        countries = sorted(df['state'].unique().tolist())
+        # Cities per country in one grouped pass
+        cities_by_country = df.groupby('state', sort=True, observed=True)['city'].unique()
+        
+        # Test countries (categories inferred by read_csv are already sorted, and so is the groupby index)
+        countries = cities_by_country.index.tolist()
         print(f"✅ Countries found: {len(countries)}")
         for i, country in enumerate(countries, 1):
             print(f"   {i}. {country}")
@@ -23,7 +27,7 @@ def test_data_loading():
         # Test cities for each country
         print(f"\n✅ Cities by country:")
         for country in countries:
-            cities = sorted(df[df['state'] == country]['city'].unique().tolist())
+            cities = cities_by_country[country].sort_values().tolist()
             print(f"   {country}: {len(cities)} cities")
             print(f"      Sample cities: {cities[:3]}{'...' if len(cities) > 3 else ''}")
         
@@ -56,19 +60,17 @@ def test_dashboard_functions():
         print(f"✅ get_countries_and_cities() returned {len(countries)} countries")
         
         # Verify all expected countries are present
-        expected_countries = ['California', 'Florida', 'India', 'Indonesia', 'Japan', 'New York', 'Philippines', 'Texas']
-        actual_countries = set(countries)
-        expected_set = set(expected_countries)
+        expected_countries = pd.Index(['California', 'Florida', 'India', 'Indonesia', 'Japan', 'New York', 'Philippines', 'Texas'])
+        actual_countries = pd.Index(countries)
+        missing = expected_countries.difference(actual_countries)
         
-        if expected_set.issubset(actual_countries):
+        if missing.empty:
             print("✅ All expected countries are present in the dataset")
         else:
-            missing = expected_set - actual_countries
-            extra = actual_countries - expected_set
-            if missing:
-                print(f"⚠️ Missing countries: {missing}")
-            if extra:
-                print(f"ℹ️ Extra countries: {extra}")
+            extra = actual_countries.difference(expected_countries)
+            print(f"⚠️ Missing countries: {missing.tolist()}")
+            if not extra.empty:
+                print(f"ℹ️ Extra countries: {extra.tolist()}")
         
         return True
         
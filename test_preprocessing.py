@@ -0,0 +1,79 @@
+"""
+Test script to verify categorical encoding of values unseen during training.
+"""
+
+import sys
+import pandas as pd
+sys.path.append('src')
+
+from data_preprocessing import DisasterDataPreprocessor, UNSEEN_CATEGORY_CODE
+
+def test_unseen_categories():
+    """Unseen categories encode to the sentinel code, in batch and single-input paths."""
+    print("Testing unseen category encoding...")
+    
+    train = pd.DataFrame({
+        'year': [2000, 2001, 2002, 2003],
+        'disaster_type': ['flood', 'earthquake', 'flood', 'drought'],
+        'state': ['India', 'Japan', 'India', 'Texas'],
+        'district': ['Delhi', 'Tokyo', 'Mumbai', 'Houston'],
+        'people_affected': [100.0, 2000.0, 300.0, 50.0],
+        'deaths': [1.0, 20.0, 3.0, 0.0],
+        'damages': [1000.0, 50000.0, 2000.0, 500.0]
+    })
+    
+    preprocessor = DisasterDataPreprocessor()
+    encoded = preprocessor.encode_categorical_features(train, fit=True)
+    preprocessor.normalize_features(encoded, fit=True)
+    
+    # Fitted codes are 0..K-1 and never collide with the sentinel
+    for col, mapping in preprocessor.cat_maps.items():
+        assert sorted(mapping.values()) == list(range(len(mapping))), col
+        assert 'Unknown' not in mapping, col
+    
+    new = train.head(2).copy()
+    new.loc[0, 'disaster_type'] = 'volcano'
+    new.loc[1, 'state'] = 'Atlantis'
+    batch = preprocessor.encode_categorical_features(new, fit=False)
+    
+    assert batch.loc[0, 'disaster_type'] == UNSEEN_CATEGORY_CODE
+    assert batch.loc[1, 'state'] == UNSEEN_CATEGORY_CODE
+    assert batch.loc[0, 'state'] == preprocessor.cat_maps['state']['India']
+    assert batch.loc[1, 'disaster_type'] == preprocessor.cat_maps['disaster_type']['earthquake']
+    
+    row = preprocessor.preprocess_single_input({
+        'year': 2001, 'disaster_type': 'volcano', 'state': 'Japan', 'district': 'Tokyo',
+        'people_affected': 2000.0, 'deaths': 20.0, 'damages': 50000.0
+    })
+    features = preprocessor._single_input_plan()[0]
+    assert row[0, features.index('disaster_type')] == UNSEEN_CATEGORY_CODE
+    assert row[0, features.index('state')] == preprocessor.cat_maps['state']['Japan']
+    
+    print("✅ Unseen categories encode to the sentinel code")
+
+def test_clean_categorical_gaps():
+    """Missing values in categorical columns (as read from Parquet) are filled with 'Unknown'."""
+    print("Testing categorical gap filling...")
+    
+    df = pd.DataFrame({
+        'year': [2000, 2001, 2002],
+        'disaster_type': pd.Categorical(['flood', None, 'drought']),
+        'state': pd.Categorical(['India', 'Japan', None]),
+        'district': ['Delhi', None, 'Houston'],
+        'people_affected': [100.0, None, 50.0],
+        'deaths': [1.0, 2.0, 0.0],
+        'damages': [1000.0, 500.0, 2000.0]
+    })
+    
+    cleaned = DisasterDataPreprocessor().clean_data(df)
+    
+    assert cleaned['disaster_type'].tolist() == ['flood', 'Unknown', 'drought']
+    assert cleaned['state'].tolist() == ['India', 'Japan', 'Unknown']
+    assert cleaned['district'].tolist() == ['Delhi', 'Unknown', 'Houston']
+    assert cleaned['people_affected'].tolist() == [100.0, 75.0, 50.0]
+    
+    print("✅ Categorical gaps filled with 'Unknown'")
+
+if __name__ == "__main__":
+    test_unseen_categories()
+    test_clean_categorical_gaps()
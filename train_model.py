@@ -1,6 +1,6 @@
 """
 Complete training pipeline for disaster severity prediction model.
-Combines data preprocessing and Random Forest model training.
+Combines data preprocessing and gradient boosting model training.
 """
 
 import sys
@@ -45,7 +45,8 @@ def main():
     print("-" * 30)
     
     model, evaluation_results = train_disaster_model(
-        X_train, X_test, y_train, y_test, model_file
+        X_train, X_test, y_train, y_test, model_file,
+        feature_names=preprocessor.feature_names_
     )
     
     # Step 3: Results Summary
@@ -80,7 +81,8 @@ def main():
     os.makedirs('models', exist_ok=True)
     
     try:
-        joblib.dump(preprocessor, preprocessor_file)
+        # Compressed like the model file (zlib, since lz4 is not a dependency); protocol 5 is the newest pickle format
+        joblib.dump(preprocessor, preprocessor_file, compress=3, protocol=5)
         print(f"Preprocessor saved to: {preprocessor_file}")
         print(f"Model saved to: {model_file}")
     except Exception as e:
@@ -2,11 +2,20 @@
 Update disaster dataset with real city names instead of generic district names
 """
 
+import os
 import pandas as pd
-import random
+import numpy as np
 
-# Read the current dataset
-df = pd.read_csv('data/disaster_data.csv')
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+except ImportError:  # pragma: no cover - fall back to pandas' writer
+    pa = None
+
+DATA_PATH = 'data/disaster_data.csv'
+
+# Rows per chunk; the dataset is streamed so peak memory stays at one chunk
+CHUNK_SIZE = 50_000
 
 # Define real city names for each state/region
 city_mapping = {
@@ -20,36 +29,92 @@ city_mapping = {
     'Indonesia': ['Jakarta', 'Surabaya', 'Bandung', 'Bekasi', 'Medan', 'Tangerang', 'Depok', 'Semarang', 'Palembang', 'Makassar']
 }
 
-def update_district_to_city(row):
-    """Update district column with real city names based on state."""
-    state = row['state']
-    if state in city_mapping:
-        # Randomly select a city from the available cities for this state
-        return random.choice(city_mapping[state])
-    else:
-        # Keep original district if state not in mapping
-        return row['district']
+# All cities in one flat array; each state owns the slice [start, start + count)
+all_cities = np.array([city for cities in city_mapping.values() for city in cities], dtype=object)
+city_counts = {state: len(cities) for state, cities in city_mapping.items()}
+city_starts = dict(zip(city_mapping, np.cumsum([0] + list(city_counts.values())[:-1]).tolist()))
+
+def update_districts_to_cities(df, rng):
+    """Replace district names with random real cities of their state in a single gather over all rows."""
+    state_codes = df['state'].cat.codes.to_numpy()
+    categories = df['state'].cat.categories
+    
+    # Per-category slice of all_cities; the trailing entry serves missing states (code -1)
+    starts = np.array([city_starts.get(state, -1) for state in categories] + [-1])
+    counts = np.array([city_counts.get(state, 0) for state in categories] + [0])
+    row_starts = starts[state_codes]
+    row_counts = counts[state_codes]
+    
+    # One uniform draw per row, scaled into that row's slice
+    idx = row_starts + (rng.random(len(df)) * row_counts).astype(np.int64)
+    
+    # Rows whose state is not in the mapping keep their original district
+    mapped = row_starts >= 0
+    districts = df['district'].to_numpy(dtype=object, copy=True)
+    districts[mapped] = all_cities[idx[mapped]]
+    df['district'] = districts
 
-# Set random seed for reproducibility
-random.seed(42)
+def to_arrow(df, schema=None):
+    """Convert a chunk to an Arrow table with categoricals (and all-null columns) as plain strings, cast to schema if given."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if schema is None:
+        schema = pa.schema([
+            f.with_type(pa.string()) if pa.types.is_dictionary(f.type) or pa.types.is_null(f.type) else f
+            for f in table.schema
+        ])
+    return table.cast(schema)
 
-# Update the district column to city names
+# Seeded generator for reproducibility
+rng = np.random.default_rng(42)
+
+# Update the district column to city names, one chunk at a time, into a temp file
 print("Updating district names to real city names...")
-df['district'] = df.apply(update_district_to_city, axis=1)
+tmp_path = DATA_PATH + '.tmp'
+total_records = 0
+sample = None
+cities_by_state = {}  # state -> cities in first-seen order (dict keys)
+
+writer = None
+schema = None
 
-# Rename the column from 'district' to 'city' for clarity
-df = df.rename(columns={'district': 'city'})
+with open(tmp_path, 'wb') as out:
+    # state is only compared against, so read it as a categorical
+    for i, chunk in enumerate(pd.read_csv(DATA_PATH, dtype={'state': 'category'}, chunksize=CHUNK_SIZE)):
+        update_districts_to_cities(chunk, rng)
+        
+        # Rename the column from 'district' to 'city' for clarity
+        chunk = chunk.rename(columns={'district': 'city'})
+        
+        # Arrow's C++ CSV writer when available; every chunk is cast to the first chunk's schema.
+        # Arrow quotes every string field (pandas only quotes where needed); both read back the same
+        if pa is None:
+            out.write(chunk.to_csv(index=False, header=(i == 0)).encode())
+        else:
+            table = to_arrow(chunk, schema)
+            if writer is None:
+                schema = table.schema
+                writer = pcsv.CSVWriter(out, schema, write_options=pcsv.WriteOptions(quoting_style='needed', quoting_header='none'))
+            writer.write_table(table)
+        
+        if sample is None:
+            sample = chunk.head(10)
+        total_records += len(chunk)
+        for state, cities in chunk.groupby('state', sort=False, observed=True)['city'].unique().items():
+            cities_by_state.setdefault(state, {}).update(dict.fromkeys(cities))
+    
+    # Flush the Arrow writer while the file is still open
+    if writer is not None:
+        writer.close()
 
-# Save the updated dataset
-df.to_csv('data/disaster_data.csv', index=False)
+# Replace the dataset only once every chunk is written
+os.replace(tmp_path, DATA_PATH)
 
 print("Dataset updated successfully!")
 print("\nSample of updated data:")
-print(df.head(10))
+print(sample)
 
-print(f"\nTotal records: {len(df)}")
+print(f"\nTotal records: {total_records}")
 print("\nCity distribution by state:")
-for state in df['state'].unique():
-    state_data = df[df['state'] == state]
-    cities = state_data['city'].unique()
-    print(f"{state}: {len(cities)} cities - {', '.join(cities[:5])}{'...' if len(cities) > 5 else ''}")
\ No newline at end of file
+for state, cities in cities_by_state.items():
+    cities = list(cities)
+    print(f"{state}: {len(cities)} cities - {', '.join(cities[:5])}{'...' if len(cities) > 5 else ''}")